@@ -0,0 +1,162 @@
+"""
+Image asset loader for ST7735
+Streams RGB565 image files from flash straight to the panel window
+(without going through the 40 KB framebuffer)
+
+Image files are created on the host with tools/img2rgb565.py.
+"""
+
+import struct
+import array
+import micropython
+
+MAGIC = b"R565"
+HEADER = ">4sHHH"
+HEADER_SIZE = 10
+FLAG_RLE = 0x0001
+
+# ストリーミング用チャンクサイズ（バイト）
+CHUNK_SIZE = 1024
+
+# 再利用するバッファ（reserve() か初回使用時に確保）
+_chunk = None
+_out = None
+_header = bytearray(HEADER_SIZE)
+# RLE展開の状態: [入力位置, モード, 残り数, 色上位, 色下位, 出力位置]
+_state = array.array("i", [0] * 6)
+
+# Viperネイティブコードで RLE を展開
+@micropython.viper
+def _rle_step(src, src_len: int, dst, dst_len: int, st) -> int:
+    """src を dst に展開し、dst の書き込み位置を返す（入力切れ or dst満杯で戻る）"""
+    s = ptr8(src)
+    d = ptr8(dst)
+    t = ptr32(st)
+    i = int(t[0])
+    mode = int(t[1])
+    count = int(t[2])
+    hi = int(t[3])
+    lo = int(t[4])
+    o = int(t[5])
+    while o < dst_len:
+        if mode == 4:
+            # 同色ピクセルを出力
+            if count == 0:
+                mode = 0
+                continue
+            d[o] = hi
+            d[o + 1] = lo
+            o += 2
+            count -= 1
+            continue
+        if mode == 1:
+            # リテラルバイトをコピー
+            if count == 0:
+                mode = 0
+                continue
+            if i >= src_len:
+                break
+            d[o] = s[i]
+            i += 1
+            o += 1
+            count -= 1
+            continue
+        if i >= src_len:
+            break
+        b = int(s[i])
+        i += 1
+        if mode == 0:
+            if b & 0x80:
+                mode = 2
+                count = (b & 0x7F) + 1
+            else:
+                mode = 1
+                count = (b + 1) * 2
+        elif mode == 2:
+            hi = b
+            mode = 3
+        else:
+            lo = b
+            mode = 4
+    t[0] = i
+    t[1] = mode
+    t[2] = count
+    t[3] = hi
+    t[4] = lo
+    t[5] = o
+    return o
+
+def _buffers():
+    global _chunk, _out
+    if _chunk is None:
+        _chunk = bytearray(CHUNK_SIZE)
+        _out = bytearray(CHUNK_SIZE)
+    return _chunk, _out
+
+def reserve():
+    """チャンクバッファを先に確保する（画像を表示するフェーズで割り当てない）"""
+    _buffers()
+
+def image_size(path):
+    """画像ファイルの (width, height) を返す"""
+    with open(path, "rb") as f:
+        f.readinto(_header)
+    magic, width, height, _ = struct.unpack(HEADER, _header)
+    if magic != MAGIC:
+        raise ValueError("not an RGB565 image: " + path)
+    return width, height
+
+def show_image(display, path, x=0, y=0):
+    """
+    画像ファイルをパネルに直接転送する（フレームバッファは変更しない）
+
+    Args:
+        display: ST7735 display object
+        path: image file created by tools/img2rgb565.py
+        x, y: top-left position on the screen
+
+    Returns:
+        (width, height) of the image
+    """
+    chunk, out = _buffers()
+    with open(path, "rb") as f:
+        f.readinto(_header)
+        magic, width, height, flags = struct.unpack(HEADER, _header)
+        if magic != MAGIC:
+            raise ValueError("not an RGB565 image: " + path)
+        if x < 0 or y < 0 or x + width > display.width or y + height > display.height:
+            raise ValueError("image does not fit on the screen")
+
+        display.set_window(x, y, x + width - 1, y + height - 1)
+        chunk_mv = memoryview(chunk)
+        if not flags & FLAG_RLE:
+            # 非圧縮: 読み込んだチャンクをそのまま転送
+            while True:
+                n = f.readinto(chunk)
+                if not n:
+                    break
+                display.write_data(chunk_mv[:n])
+            return width, height
+
+        # RLE: チャンク単位で読み込み、out に展開しながら転送
+        out_len = len(out)
+        st = _state
+        for i in range(6):
+            st[i] = 0
+        n = 0
+        eof = False
+        while True:
+            if st[0] >= n and not eof:
+                n = f.readinto(chunk) or 0
+                st[0] = 0
+                eof = n == 0
+            o = _rle_step(chunk, n, out, out_len, st)
+            if o == out_len:
+                display.write_data(out)
+                st[5] = 0
+            elif eof:
+                # 入力終端: 展開済みの残りを転送して終了
+                if o:
+                    display.write_data(memoryview(out)[:o])
+                break
+    return width, height
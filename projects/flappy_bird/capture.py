@@ -0,0 +1,210 @@
+"""
+Frame capture over USB serial
+
+Sends every frame drawn by ST7735.show() to the USB serial port so the
+screen can be recorded on the host. Each run of identical consecutive
+rows is sent once with its row count, and that row is RLE compressed.
+Every frame is complete, so a decoder can join a running stream at any
+frame.
+
+There is no delta against the previous frame: on the flappy bird scene
+the scrolling pipes change most 16-pixel column blocks of every row, and
+sending only the changed blocks saved 1.4% over whole frames, while
+merging identical rows cuts a frame from about 3 KB to 850 bytes.
+
+Only show() is captured. Screens drawn straight to the panel with the
+*_direct calls or assets.show_image() (title, game over, launcher menu)
+never reach the framebuffer and are not in the stream; a decoder keeps
+showing the last show() frame while they are up.
+
+    import runtime, capture, launcher
+    capture.attach(runtime.get().display)
+    launcher.main()
+
+Stream format (big-endian):
+    frame header ">4sHHHH": MAGIC, seq, width, height, groups
+    per group ">H":         number of identical rows
+                            then the row RLE-encoded once (tools/img2rgb565.py format)
+
+Decoded on the host with tools/capture_decode.py.
+"""
+
+import sys
+import time
+import array
+import micropython
+from micropython import const
+
+MAGIC = b"FCAP"
+HEADER = ">4sHHHH"
+HEADER_SIZE = 12
+
+# RLE パケットの最大ピクセル数（img2rgb565.RLE_MAX と同じ）
+RLE_MAX = const(128)
+
+# 送信バッファのサイズ（これを超えたら書き出す）
+OUT_SIZE = 1024
+
+# Viperネイティブコードで1行分を RLE 符号化
+@micropython.viper
+def _encode_row(src, start: int, count: int, dst, pos: int) -> int:
+    """src[start:] の count ピクセル (BE) を dst[pos:] に符号化し、終了位置を返す"""
+    s = ptr8(src)
+    d = ptr8(dst)
+    i = 0
+    lit = 0
+    lit_pos = 0
+    while i < count:
+        p = start + i * 2
+        hi = int(s[p])
+        lo = int(s[p + 1])
+        run = 1
+        while i + run < count and run < RLE_MAX:
+            q = p + run * 2
+            if int(s[q]) != hi or int(s[q + 1]) != lo:
+                break
+            run += 1
+        if run >= 2:
+            # 同色の連続
+            if lit:
+                d[lit_pos] = lit - 1
+                lit = 0
+            d[pos] = 0x80 | (run - 1)
+            d[pos + 1] = hi
+            d[pos + 2] = lo
+            pos += 3
+            i += run
+        else:
+            # リテラル（ヘッダの位置を空けておき、長さが決まったら書く）
+            if lit == 0:
+                lit_pos = pos
+                pos += 1
+            d[pos] = hi
+            d[pos + 1] = lo
+            pos += 2
+            lit += 1
+            if lit == RLE_MAX:
+                d[lit_pos] = RLE_MAX - 1
+                lit = 0
+            i += 1
+    if lit:
+        d[lit_pos] = lit - 1
+    return pos
+
+# Viperネイティブコードで同じ内容が続く行をまとめる
+@micropython.viper
+def _group_rows(src, width: int, height: int, runs) -> int:
+    """続く同じ行の数を runs に入れ、まとまりの数を返す"""
+    s = ptr16(src)
+    r = ptr16(runs)
+    groups = 0
+    first = 0
+    y = 1
+    while y < height:
+        a = first * width
+        b = y * width
+        x = 0
+        while x < width:
+            if s[a + x] != s[b + x]:
+                break
+            x += 1
+        if x < width:
+            r[groups] = y - first
+            groups += 1
+            first = y
+        y += 1
+    r[groups] = height - first
+    return groups + 1
+
+class Capture:
+    def __init__(self, width, height, out=None):
+        """
+        Args:
+            width, height: frame size in pixels
+            out: stream with write() (default: sys.stdout.buffer)
+        """
+        self.width = width
+        self.height = height
+        self.out = out if out is not None else sys.stdout.buffer
+
+        # まとまりごとの行数（フレーム毎に確保しない）
+        self._runs = array.array("H", [0] * height)
+
+        # 1行の最悪サイズ（すべてリテラル）+ まとまりのヘッダ分の余裕を持たせる
+        self._buf = bytearray(OUT_SIZE + width * 2 + width // RLE_MAX + 4)
+        self._pos = 0
+
+        self.seq = 0
+        self.frames = 0
+        self.bytes_sent = 0
+        self.raw_bytes = 0
+        self.last_us = 0
+        self.max_us = 0
+        self.total_us = 0
+
+    def _flush(self):
+        if self._pos:
+            self.out.write(memoryview(self._buf)[:self._pos])
+            self.bytes_sent += self._pos
+            self._pos = 0
+
+    def _put16(self, value):
+        buf = self._buf
+        pos = self._pos
+        buf[pos] = (value >> 8) & 0xFF
+        buf[pos + 1] = value & 0xFF
+        self._pos = pos + 2
+
+    def frame(self, frame):
+        """ビッグエンディアン RGB565 のフレームを送信する（show() から呼ばれる）"""
+        start = time.ticks_us()
+        height = self.height
+        width = self.width
+        row_bytes = width * 2
+        runs = self._runs
+        groups = _group_rows(frame, width, height, runs)
+
+        # フレームヘッダ
+        buf = self._buf
+        buf[0:4] = MAGIC
+        self._pos = 4
+        self._put16(self.seq)
+        self._put16(width)
+        self._put16(height)
+        self._put16(groups)
+
+        # まとまりごとに先頭の行だけを符号化
+        y = 0
+        for i in range(groups):
+            if self._pos > OUT_SIZE:
+                self._flush()
+            self._put16(runs[i])
+            self._pos = _encode_row(frame, y * row_bytes, width, buf, self._pos)
+            y += runs[i]
+        self._flush()
+
+        self.seq = (self.seq + 1) & 0xFFFF
+        self.frames += 1
+        self.raw_bytes += row_bytes * height
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self.last_us = elapsed
+        self.total_us += elapsed
+        if elapsed > self.max_us:
+            self.max_us = elapsed
+
+    def ratio(self):
+        """送信バイト数 / 非圧縮バイト数"""
+        return self.bytes_sent / self.raw_bytes if self.raw_bytes else 0
+
+    def report(self):
+        frames = max(self.frames, 1)
+        print("capture frames={} bytes={} ratio={:.3f} avg_us={} max_us={}".format(
+            self.frames, self.bytes_sent, self.ratio(), self.total_us // frames, self.max_us))
+
+def attach(display, out=None):
+    """display の show() ごとにフレームを送信する"""
+    display.capture = Capture(display.width, display.height, out)
+    return display.capture
+
+def detach(display):
+    display.capture = None
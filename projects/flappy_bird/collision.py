@@ -0,0 +1,119 @@
+"""
+Pixel-accurate collision with packed 1-bit masks
+Masks are MONO_HLSB bitmaps precomputed once per sprite frame.
+Overlap tests do an AABB early-out, then AND 24-bit words of the
+intersecting rows in viper native code.
+"""
+
+import framebuf
+import micropython
+
+class Mask:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # 1行のバイト数（4バイト単位で読むため3バイトの余白を付ける）
+        self.stride = (width + 7) // 8 + 3
+        self.data = bytearray(self.stride * height)
+        self.fbuf = framebuf.FrameBuffer(self.data, width, height, framebuf.MONO_HLSB, self.stride * 8)
+
+    @classmethod
+    def from_rect(cls, width, height):
+        """全面が当たり判定の矩形マスク"""
+        mask = cls(width, height)
+        mask.fbuf.fill_rect(0, 0, width, height, 1)
+        return mask
+
+    @classmethod
+    def from_fbuf(cls, fbuf, width, height, key=0):
+        """スプライトのフレームバッファから作成（key 色のピクセルは透明）"""
+        mask = cls(width, height)
+        for y in range(height):
+            for x in range(width):
+                if fbuf.pixel(x, y) != key:
+                    mask.fbuf.pixel(x, y, 1)
+        return mask
+
+    @classmethod
+    def from_rgb565(cls, buf, width, height, key=0):
+        """RGB565バッファ（リトルエンディアン）から作成"""
+        fbuf = framebuf.FrameBuffer(buf, width, height, framebuf.RGB565)
+        return cls.from_fbuf(fbuf, width, height, key)
+
+# Viperネイティブコードで交差する行だけをワード単位でAND
+@micropython.viper
+def _overlap_rows(a, a_stride: int, a_row: int, a_bit: int,
+                  b, b_stride: int, b_row: int, b_bit: int,
+                  rows: int, bits: int) -> bool:
+    pa = ptr8(a)
+    pb = ptr8(b)
+    r = 0
+    while r < rows:
+        ia = (a_row + r) * a_stride
+        ib = (b_row + r) * b_stride
+        off = 0
+        while off < bits:
+            # 任意のビット位置から24ビットを取り出す
+            pos = a_bit + off
+            i = ia + (pos >> 3)
+            wa = ((int(pa[i]) << 24) | (int(pa[i + 1]) << 16)
+                  | (int(pa[i + 2]) << 8) | int(pa[i + 3])) >> (8 - (pos & 7))
+            pos = b_bit + off
+            i = ib + (pos >> 3)
+            wb = ((int(pb[i]) << 24) | (int(pb[i + 1]) << 16)
+                  | (int(pb[i + 2]) << 8) | int(pb[i + 3])) >> (8 - (pos & 7))
+            n = bits - off
+            if n > 24:
+                n = 24
+            if wa & wb & ((0xFFFFFF >> (24 - n)) << (24 - n)):
+                return True
+            off += 24
+        r += 1
+    return False
+
+@micropython.viper
+def _any_rows(a, a_stride: int, a_row: int, a_bit: int, rows: int, bits: int) -> bool:
+    pa = ptr8(a)
+    r = 0
+    while r < rows:
+        ia = (a_row + r) * a_stride
+        off = 0
+        while off < bits:
+            pos = a_bit + off
+            i = ia + (pos >> 3)
+            wa = ((int(pa[i]) << 24) | (int(pa[i + 1]) << 16)
+                  | (int(pa[i + 2]) << 8) | int(pa[i + 3])) >> (8 - (pos & 7))
+            n = bits - off
+            if n > 24:
+                n = 24
+            if wa & ((0xFFFFFF >> (24 - n)) << (24 - n)):
+                return True
+            off += 24
+        r += 1
+    return False
+
+def overlap(a, ax, ay, b, bx, by):
+    """マスク a (ax, ay) と b (bx, by) が1ピクセルでも重なれば True"""
+    x0 = ax if ax > bx else bx
+    x1 = min(ax + a.width, bx + b.width)
+    if x0 >= x1:
+        return False
+    y0 = ay if ay > by else by
+    y1 = min(ay + a.height, by + b.height)
+    if y0 >= y1:
+        return False
+    return _overlap_rows(a.data, a.stride, y0 - ay, x0 - ax,
+                         b.data, b.stride, y0 - by, x0 - bx,
+                         y1 - y0, x1 - x0)
+
+def overlaps_rect(a, ax, ay, x, y, w, h):
+    """マスク a (ax, ay) と塗りつぶし矩形が重なれば True"""
+    x0 = ax if ax > x else x
+    x1 = min(ax + a.width, x + w)
+    if x0 >= x1:
+        return False
+    y0 = ay if ay > y else y
+    y1 = min(ay + a.height, y + h)
+    if y0 >= y1:
+        return False
+    return _any_rows(a.data, a.stride, y0 - ay, x0 - ax, y1 - y0, x1 - x0)
@@ -3,32 +3,39 @@ Flappy Bird Game for Raspberry Pi Pico
 128x160 TFT Display with ST7735R
 """
 
-from machine import Pin, SPI, PWM
 import time
 import random
-import st7735 as st7735
-
-# ハードウェア設定
-# ディスプレイ用SPI設定（ST7735S）
-spi = SPI(0, baudrate=20000000, polarity=0, phase=0,
-          sck=Pin(2), mosi=Pin(3))
-cs = Pin(6, Pin.OUT)
-dc = Pin(5, Pin.OUT)
-rst = Pin(4, Pin.OUT)
-# BL(バックライト)はVCCに接続
-
-# ボタン設定
-btn_a = Pin(28, Pin.IN, Pin.PULL_UP)  # ジャンプボタン
-
-# ブザー設定
-buzzer = PWM(Pin(0))
-
-# ディスプレイ初期化
-# Some ST7735 modules use BGR byte order. If your display shows
-# a strong blue tint, set bgr=False to use RGB ordering.
-# xoffset=2, yoffset=1 で右端と下端のランダムドットを修正
-display = st7735.ST7735(spi, cs=cs, dc=dc, rst=rst, width=128, height=160, bgr=False, xoffset=2, yoffset=1, rotation=180)
-display.init()
+import framebuf
+import assets
+import idle
+import collision
+import memtel
+import scene
+import sprites
+
+# ハードウェア（run() でランタイムから受け取る）
+display = None
+btn_a = None
+btn_start = None
+buttons = None   # inputscan.Scanner（全ボタンを1回のレジスタ読み出しで走査）
+bit_a = 0
+buzzer = None
+store = None
+
+# ハイスコアの保存キー
+HIGH_SCORE_KEY = "hi_fb"
+
+# 効果音（ソークテストではオフにする）
+sound_enabled = True
+
+# Trueにするとフレームをシーンリストに登録し、各ピクセルを1回だけ書き込んで描画
+RETAINED_RENDER = False
+
+# ヒープ計測フェーズ（1回あたりの割り当て量の上限 bytes）
+PH_TITLE = memtel.phase("flappy.title", 2048)
+PH_GAME = memtel.phase("flappy.game", 4096)
+PH_FRAME = memtel.phase("flappy.frame", 512)
+PH_OVER = memtel.phase("flappy.over", 2048)
 
 # ゲーム定数
 SCREEN_WIDTH = 128
@@ -51,6 +58,26 @@ RED = 0xF800
 GREEN = 0x07E0
 BLUE = 0x001F
 
+# タイトル画像（tools/img2rgb565.py で変換してPicoにアップロード）
+TITLE_IMAGE = "title.img"
+
+def make_bird_sprite():
+    """鳥のスプライト（黄色の四角に目）"""
+    buf = bytearray(BIRD_SIZE * BIRD_SIZE * 2)
+    fbuf = framebuf.FrameBuffer(buf, BIRD_SIZE, BIRD_SIZE, framebuf.RGB565)
+    fbuf.fill(BIRD_YELLOW)
+    fbuf.fill_rect(5, 2, 2, 2, BLACK)
+    return sprites.Sprite(buf, BIRD_SIZE, BIRD_SIZE)
+
+BIRD_SPRITE = make_bird_sprite()
+
+# 鳥の傾き（回転ステップ、1ステップ = 22.5度）の範囲
+BIRD_TILT_MIN = -1
+BIRD_TILT_MAX = 3
+
+# 傾けた鳥のスプライトのキャッシュ（傾きごとの当たり判定マスクも持つ）
+sprite_cache = sprites.SpriteCache(budget=2048, masks=True)
+
 class Bird:
     def __init__(self):
         self.x = 30
@@ -74,10 +101,17 @@ class Bird:
             self.y = SCREEN_HEIGHT - self.size
             self.velocity = 0
     
-    def draw(self):
-        display.fill_rect(self.x, self.y, self.size, self.size, BIRD_YELLOW)
-        # 目を描画
-        display.fill_rect(self.x + 5, self.y + 2, 2, 2, BLACK)
+    def tilt(self):
+        """速度に合わせた傾き（上昇中は上向き、落下が速いほど下向き）"""
+        return max(BIRD_TILT_MIN, min(BIRD_TILT_MAX, self.velocity // 2))
+    
+    def variant(self):
+        """今の傾きのスプライト（当たり判定マスクと描画位置のずれ ox, oy を持つ）"""
+        return sprite_cache.get(BIRD_SPRITE, self.tilt())
+    
+    def draw(self, target=None):
+        target = target or display
+        sprite_cache.draw(target, BIRD_SPRITE, self.x, self.y, self.tilt())
 
 class Pipe:
     def __init__(self, x):
@@ -89,30 +123,36 @@ class Pipe:
     def update(self):
         self.x -= PIPE_SPEED
     
-    def draw(self):
+    def draw(self, target=None):
+        target = target or display
         # 上のパイプ
-        display.fill_rect(self.x, 0, self.width, self.gap_y, PIPE_GREEN)
-        display.rect(self.x, 0, self.width, self.gap_y, WHITE)
+        target.fill_rect(self.x, 0, self.width, self.gap_y, PIPE_GREEN)
+        target.rect(self.x, 0, self.width, self.gap_y, WHITE)
         
         # 下のパイプ
         bottom_y = self.gap_y + PIPE_GAP
         bottom_height = SCREEN_HEIGHT - bottom_y
-        display.fill_rect(self.x, bottom_y, self.width, bottom_height, PIPE_GREEN)
-        display.rect(self.x, bottom_y, self.width, bottom_height, WHITE)
+        target.fill_rect(self.x, bottom_y, self.width, bottom_height, PIPE_GREEN)
+        target.rect(self.x, bottom_y, self.width, bottom_height, WHITE)
     
     def is_offscreen(self):
         return self.x + self.width < 0
     
     def collides_with(self, bird):
-        # 鳥がパイプの横の範囲内にいるか
-        if bird.x + bird.size > self.x and bird.x < self.x + self.width:
-            # 上のパイプまたは下のパイプに当たったか
-            if bird.y < self.gap_y or bird.y + bird.size > self.gap_y + PIPE_GAP:
-                return True
-        return False
+        # 上のパイプまたは下のパイプに、描画したのと同じ傾きの鳥のマスクが重なったか
+        v = bird.variant()
+        x = bird.x + v.ox
+        y = bird.y + v.oy
+        if collision.overlaps_rect(v.mask, x, y, self.x, 0, self.width, self.gap_y):
+            return True
+        bottom_y = self.gap_y + PIPE_GAP
+        return collision.overlaps_rect(v.mask, x, y,
+                                       self.x, bottom_y, self.width, SCREEN_HEIGHT - bottom_y)
 
 def play_sound(frequency, duration):
     """ブザーで音を鳴らす"""
+    if not sound_enabled:
+        return
     try:
         buzzer.freq(frequency)
         buzzer.duty_u16(32768)  # 50% duty cycle
@@ -121,33 +161,45 @@ def play_sound(frequency, duration):
     except Exception:
         pass
 
-# ボタンの前回の状態を記憶
-button_state = {"prev": 1}
-
 def read_button():
-    """ボタン入力を読み取る（押した瞬間のみ検出）"""
-    current = btn_a.value()
-    # 前回が押されていない(1)で、今回押されている(0)場合のみTrue
-    if button_state["prev"] == 1 and current == 0:
-        button_state["prev"] = current
-        return True
-    button_state["prev"] = current
-    return False
-
-def draw_background():
+    """Aボタンを押した瞬間だけ True"""
+    buttons.update()
+    return (buttons.pressed & bit_a) != 0
+
+def draw_background(target=None):
     """背景を描画"""
+    target = target or display
     # 空
-    display.fill_rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT - 20, SKY_BLUE)
+    target.fill_rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT - 20, SKY_BLUE)
     # 地面
-    display.fill_rect(0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20, GROUND_GREEN)
+    target.fill_rect(0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20, GROUND_GREEN)
+
+def draw_frame(target, bird, pipes, score):
+    """1フレーム分を描画（display に直接、または Scene に登録）"""
+    draw_background(target)
+    
+    for pipe in pipes:
+        pipe.draw(target)
+    
+    bird.draw(target)
+    
+    # スコア表示
+    target.text("Score:" + str(score), 5, 5, WHITE)
 
 def game_over_screen(score):
     """ゲームオーバー画面"""
-    display.fill_rect(20, 60, 88, 40, BLACK)
-    display.rect(20, 60, 88, 40, RED)
-    display.text("GAME OVER", 25, 70, RED)
-    display.text("Score: " + str(score), 30, 85, WHITE)
-    display.show()
+    # ハイスコアはRAM上で更新し、書き込みは待機前にまとめて行う
+    best = store.get(HIGH_SCORE_KEY, 0)
+    if score > best:
+        best = score
+        store.set(HIGH_SCORE_KEY, best)
+    
+    # 最後のゲーム画面の上に直接描画（全画面転送なし）
+    display.fill_rect_direct(20, 55, 88, 50, BLACK)
+    display.rect_direct(20, 55, 88, 50, RED)
+    display.text_direct("GAME OVER", 25, 62, RED, BLACK)
+    display.text_direct("Score: " + str(score), 30, 77, WHITE, BLACK)
+    display.text_direct("Best: " + str(best), 30, 91, WHITE, BLACK)
     
     # ゲームオーバー音
     play_sound(300, 100)
@@ -157,36 +209,58 @@ def game_over_screen(score):
     play_sound(100, 200)
     
     # リスタート待ち
-    display.text("Press A", 35, 110, WHITE)
-    display.show()
+    display.text_direct("Press A", 35, 110, WHITE, BLACK)
     
-    while True:
-        if read_button():
-            break
-        time.sleep_ms(50)
+    # アイドル中にハイスコアを保存（ゲームループを止めない）
+    store.flush()
+    
+    # ボタンが押されるまで低消費電力で待機
+    idle.wait_press([btn_a])
+    # 押したままのボタンを次のフレームで押下と判定しない
+    buttons.update()
 
 def title_screen():
-    """タイトル画面"""
-    display.fill(SKY_BLUE)
-    display.text("FLAPPY BIRD", 20, 50, BIRD_YELLOW)
-    display.text("Press A", 35, 90, WHITE)
-    display.text("to Start", 30, 105, WHITE)
-    display.show()
+    """タイトル画面（STARTボタンで False を返してランチャーに戻る）"""
+    try:
+        # 画像があればフラッシュから直接パネルへ転送
+        assets.show_image(display, TITLE_IMAGE)
+    except OSError:
+        display.fill_direct(SKY_BLUE)
+        display.text_direct("FLAPPY BIRD", 20, 50, BIRD_YELLOW, SKY_BLUE)
+        display.text_direct("Press A", 35, 90, WHITE, SKY_BLUE)
+        display.text_direct("to Start", 30, 105, WHITE, SKY_BLUE)
     
-    while True:
-        if read_button():
-            break
-        time.sleep_ms(50)
+    pin = idle.wait_press([btn_a, btn_start])
+    # 押したままのボタンを次のフレームで押下と判定しない
+    buttons.update()
+    return pin is not btn_start
 
-def main_game():
-    """メインゲームループ"""
+def main_game(autopilot=None, frame_ms=30):
+    """
+    メインゲームループ
+    
+    Args:
+        autopilot: function(bird, pipes) -> bool called once per frame
+                   instead of reading the button (True = jump)
+        frame_ms: delay per frame; 0 runs uncapped
+    """
     bird = Bird()
     pipes = [Pipe(SCREEN_WIDTH + i * 80) for i in range(3)]
+    # 傾きごとのスプライトを先に作っておく（フレーム中に生成しない）
+    for tilt in range(BIRD_TILT_MIN, BIRD_TILT_MAX + 1):
+        sprite_cache.get(BIRD_SPRITE, tilt)
     score = 0
+    frame_scene = scene.Scene(display) if RETAINED_RENDER else None
     
     while True:
+        memtel.begin(PH_FRAME)
+        
         # 入力処理
-        if read_button():
+        if autopilot is None:
+            jump = read_button()
+        else:
+            jump = autopilot(bird, pipes)
+        if jump:
             bird.jump()
         
         # 更新処理
@@ -215,30 +289,50 @@ def main_game():
             pipes.append(Pipe(pipes[-1].x + 80))
         
         # 描画処理
-        draw_background()
-        
-        for pipe in pipes:
-            pipe.draw()
-        
-        bird.draw()
-        
-        # スコア表示
-        display.text("Score:" + str(score), 5, 5, WHITE)
+        if frame_scene is None:
+            draw_frame(display, bird, pipes, score)
+        else:
+            frame_scene.clear()
+            draw_frame(frame_scene, bird, pipes, score)
+            frame_scene.render()
         
         display.show()
+        memtel.end(PH_FRAME)
         
         # フレームレート制御
-        time.sleep_ms(30)
+        if frame_ms:
+            time.sleep_ms(frame_ms)
 
 def main():
     """メイン関数"""
     print("Flappy Bird starting...")
     
     while True:
-        title_screen()
+        memtel.begin(PH_TITLE)
+        started = title_screen()
+        memtel.end(PH_TITLE)
+        if not started:
+            return
+        memtel.begin(PH_GAME)
         score = main_game()
+        memtel.end(PH_GAME)
+        memtel.begin(PH_OVER)
         game_over_screen(score)
+        memtel.end(PH_OVER)
+
+def run(rt):
+    """ランチャーからのエントリーポイント"""
+    global display, btn_a, btn_start, buttons, bit_a, buzzer, store
+    display = rt.display
+    btn_a = rt.buttons["A"]
+    btn_start = rt.buttons["START"]
+    buttons = rt.input
+    bit_a = buttons.bit("A")
+    buzzer = rt.buzzer
+    store = rt.store
+    main()
 
 # ゲーム開始
 if __name__ == "__main__":
-    main()
+    import runtime
+    run(runtime.get())
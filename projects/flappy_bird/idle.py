@@ -0,0 +1,77 @@
+"""
+Low-power idle wait for MicroPython
+Parks the MCU in machine.lightsleep() until a button press arrives
+
+The panel keeps its own GRAM, so the screen contents stay visible
+while the CPU sleeps.
+"""
+
+import machine
+import time
+
+# 1回のスリープの上限 (ms)。ボタンIRQで起床するので押下の遅延にはならない
+MAX_SLEEP_MS = 500
+
+# 押されたピン（IRQハンドラが設定）
+_pressed = None
+
+# 直近の待機の統計
+stats = {"wakeups": 0, "wait_ms": 0}
+
+def _on_press(pin):
+    # hard IRQ（割り込みの中で実行されるので割り当てをしない）
+    global _pressed
+    if _pressed is None:
+        _pressed = pin
+
+def _lightsleep(ms):
+    machine.lightsleep(ms)
+
+def _idle(ms):
+    # 次の割り込みまでWFIで待機（lightsleepがないポート用）
+    machine.idle()
+
+# デフォルトのスリープ関数
+sleep = _lightsleep if hasattr(machine, "lightsleep") else _idle
+
+def wait_press(pins, sleeper=None):
+    """
+    いずれかのボタンが押されるまで低消費電力で待つ
+
+    IRQを止めてから押下を確認し、止めたままスリープに入る。確認とスリープの間に
+    押されても IRQ が保留されてスリープはすぐに終わるので、押下から戻るまでの最悪の
+    遅延はスリープからの復帰時間（lightsleep で1ms未満）で、MAX_SLEEP_MS ではない。
+
+    Args:
+        pins: list of Pin objects (active low, pulled up)
+        sleeper: function(ms) that parks the CPU; defaults to idle.sleep
+
+    Returns:
+        The Pin that was pressed
+    """
+    global _pressed
+    if sleeper is None:
+        sleeper = sleep
+    _pressed = None
+    # スリープ前にIRQを設定するので、待機中の押下を取りこぼさない
+    # hard=True: ハンドラが割り込みの中で動き、IRQ を戻した時点で _pressed が決まる
+    for pin in pins:
+        pin.irq(handler=_on_press, trigger=pin.IRQ_FALLING, hard=True)
+    start = time.ticks_ms()
+    wakeups = 0
+    try:
+        while True:
+            state = machine.disable_irq()
+            if _pressed is not None:
+                machine.enable_irq(state)
+                break
+            # 保留中の IRQ があればスリープはすぐに戻る
+            sleeper(MAX_SLEEP_MS)
+            machine.enable_irq(state)
+            wakeups += 1
+    finally:
+        for pin in pins:
+            pin.irq(handler=None)
+    stats["wakeups"] = wakeups
+    stats["wait_ms"] = time.ticks_diff(time.ticks_ms(), start)
+    return _pressed
@@ -0,0 +1,183 @@
+"""
+Pixel kernel registry with boot-time auto-selection
+
+Each hot loop of the driver (swap, fill, palette expand, checksum) has
+several implementations. On first boot select() benchmarks them on
+scratch buffers, picks the fastest and caches the choice in a file.
+
+    swap = kernels.get("swap")
+    swap(dest, src, len(src))
+
+Kernel signatures:
+    swap(dest, src, length)            RGB565 byte swap (LE <-> BE)
+    fill(dest, length, color)          fill with a big-endian RGB565 color
+    expand(dest, src, count, palette)  8-bit indices -> big-endian RGB565
+                                       (palette: array("H") of colors)
+    checksum(src, length) -> int       h = (h * 33 + word) & 0xFFFFFF over
+                                       little-endian 16-bit words
+"""
+
+import time
+
+# 選択結果のキャッシュファイル
+CACHE_FILE = "kernels.cfg"
+
+# ベンチマーク用バッファのサイズ（バイト）
+BENCH_SIZE = 4096
+BENCH_ROUNDS = 3
+
+# --- 純Python実装（viperのないポート用、他の実装の基準） ---
+
+def swap_python(dest, src, length):
+    for i in range(0, length, 2):
+        dest[i] = src[i + 1]
+        dest[i + 1] = src[i]
+
+def fill_python(dest, length, color):
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    for i in range(0, length, 2):
+        dest[i] = hi
+        dest[i + 1] = lo
+
+def expand_python(dest, src, count, palette):
+    for i in range(count):
+        c = palette[src[i]]
+        dest[i * 2] = (c >> 8) & 0xFF
+        dest[i * 2 + 1] = c & 0xFF
+
+def checksum_python(src, length):
+    h = 0
+    for i in range(0, length - 1, 2):
+        h = (h * 33 + (src[i] | (src[i + 1] << 8))) & 0xFFFFFF
+    return h
+
+# 種類 -> [(名前, 関数), ...]
+KERNELS = {
+    "swap": [("python", swap_python)],
+    "fill": [("python", fill_python)],
+    "expand": [("python", expand_python)],
+    "checksum": [("python", checksum_python)],
+}
+
+def register(kind, name, func):
+    KERNELS[kind].append((name, func))
+
+try:
+    import kernels_viper as _kv
+    register("swap", "viper8", _kv.swap_viper8)
+    register("swap", "viper16", _kv.swap_viper16)
+    register("swap", "viper32", _kv.swap_viper32)
+    register("swap", "viper32x4", _kv.swap_viper32x4)
+    register("swap", "native", _kv.swap_native)
+    register("fill", "viper8", _kv.fill_viper8)
+    register("fill", "viper16", _kv.fill_viper16)
+    register("fill", "viper32", _kv.fill_viper32)
+    register("expand", "viper8", _kv.expand_viper8)
+    register("expand", "viper16", _kv.expand_viper16)
+    register("checksum", "viper8", _kv.checksum_viper8)
+    register("checksum", "viper16", _kv.checksum_viper16)
+    register("checksum", "viper32", _kv.checksum_viper32)
+except (ImportError, SyntaxError):
+    # viper/native が使えないポートでは純Python実装のみ
+    pass
+
+# 種類 -> 選択された関数
+_selected = {}
+# 種類 -> 選択された名前
+selected_names = {}
+
+def find(kind, name):
+    for n, func in KERNELS[kind]:
+        if n == name:
+            return func
+    return None
+
+def _run(kind, func, a, b, palette):
+    if kind == "swap":
+        func(a, b, BENCH_SIZE)
+    elif kind == "fill":
+        func(a, BENCH_SIZE, 0x5D9F)
+    elif kind == "expand":
+        func(a, b, BENCH_SIZE // 2, palette)
+    else:
+        func(b, BENCH_SIZE)
+
+def benchmark(kind):
+    """種類ごとに全実装を計測し、[(名前, us), ...] を速い順に返す"""
+    import array
+    a = bytearray(BENCH_SIZE)
+    b = bytearray(BENCH_SIZE)
+    for i in range(BENCH_SIZE):
+        b[i] = (i * 7) & 0xFF
+    palette = array.array("H", range(0, 65536, 256))
+    results = []
+    for name, func in KERNELS[kind]:
+        best = None
+        try:
+            for _ in range(BENCH_ROUNDS):
+                start = time.ticks_us()
+                _run(kind, func, a, b, palette)
+                us = time.ticks_diff(time.ticks_us(), start)
+                if best is None or us < best:
+                    best = us
+        except Exception:
+            # このポートで動かない実装は候補から外す
+            continue
+        results.append((name, best))
+    results.sort(key=lambda r: r[1])
+    return results
+
+def _load(path):
+    names = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                kind, _, name = line.strip().partition("=")
+                if kind in KERNELS and find(kind, name) is not None:
+                    names[kind] = name
+    except OSError:
+        pass
+    return names
+
+def _save(path, names):
+    try:
+        with open(path, "w") as f:
+            for kind in KERNELS:
+                f.write("{}={}\n".format(kind, names[kind]))
+    except OSError:
+        pass
+
+def select(cache=CACHE_FILE, force=False, verbose=False):
+    """
+    各種類の実装を選ぶ（キャッシュがあればそれを使い、なければ計測して保存）
+    
+    Args:
+        cache: cache file path, or None to always benchmark without saving
+        force: ignore the cache and benchmark again
+        verbose: print the benchmark results
+    """
+    names = {} if force or cache is None else _load(cache)
+    measured = False
+    for kind in KERNELS:
+        if kind in names:
+            continue
+        results = benchmark(kind)
+        names[kind] = results[0][0]
+        measured = True
+        if verbose:
+            print(kind + ": " + ", ".join("{} {}us".format(n, us) for n, us in results))
+    for kind, name in names.items():
+        _selected[kind] = find(kind, name)
+        selected_names[kind] = name
+    if measured and cache is not None:
+        _save(cache, names)
+    return names
+
+def get(kind):
+    """選択された実装を返す（初回呼び出しで select()）"""
+    func = _selected.get(kind)
+    if func is None:
+        select(CACHE_FILE)
+        func = _selected[kind]
+    return func
@@ -0,0 +1,198 @@
+"""
+Viper / native implementations of the pixel kernels
+Kept in a separate module so that kernels.py still imports on ports
+without the viper code emitter.
+"""
+
+import micropython
+
+# --- swap: RGB565 バイトスワップ (dest, src, length) ---
+
+@micropython.viper
+def swap_viper8(dest, src, length: int):
+    """1バイトずつ、4ピクセル単位でアンロール"""
+    d = ptr8(dest)
+    s = ptr8(src)
+    i = 0
+    while i < length - 7:
+        d[i] = s[i + 1]
+        d[i + 1] = s[i]
+        d[i + 2] = s[i + 3]
+        d[i + 3] = s[i + 2]
+        d[i + 4] = s[i + 5]
+        d[i + 5] = s[i + 4]
+        d[i + 6] = s[i + 7]
+        d[i + 7] = s[i + 6]
+        i += 8
+    while i < length:
+        d[i] = s[i + 1]
+        d[i + 1] = s[i]
+        i += 2
+
+@micropython.viper
+def swap_viper16(dest, src, length: int):
+    """1ピクセル（16ビット）ずつ回転"""
+    d = ptr16(dest)
+    s = ptr16(src)
+    n = length >> 1
+    i = 0
+    while i < n:
+        x = int(s[i])
+        d[i] = ((x >> 8) | (x << 8)) & 0xFFFF
+        i += 1
+
+@micropython.viper
+def swap_viper32(dest, src, length: int):
+    """2ピクセル（32ビット）ずつ"""
+    d = ptr32(dest)
+    s = ptr32(src)
+    n = length >> 2
+    i = 0
+    while i < n:
+        x = int(s[i])
+        d[i] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        i += 1
+    if length & 2:
+        d8 = ptr8(dest)
+        s8 = ptr8(src)
+        i = length - 2
+        d8[i] = s8[i + 1]
+        d8[i + 1] = s8[i]
+
+@micropython.viper
+def swap_viper32x4(dest, src, length: int):
+    """8ピクセル（32ビット x 4）単位でアンロール"""
+    d = ptr32(dest)
+    s = ptr32(src)
+    n = length >> 2
+    i = 0
+    while i < n - 3:
+        x = int(s[i])
+        d[i] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        x = int(s[i + 1])
+        d[i + 1] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        x = int(s[i + 2])
+        d[i + 2] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        x = int(s[i + 3])
+        d[i + 3] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        i += 4
+    while i < n:
+        x = int(s[i])
+        d[i] = ((x & 0x00FF00FF) << 8) | ((x >> 8) & 0x00FF00FF)
+        i += 1
+    if length & 2:
+        d8 = ptr8(dest)
+        s8 = ptr8(src)
+        i = length - 2
+        d8[i] = s8[i + 1]
+        d8[i + 1] = s8[i]
+
+@micropython.native
+def swap_native(dest, src, length):
+    for i in range(0, length, 2):
+        dest[i] = src[i + 1]
+        dest[i + 1] = src[i]
+
+# --- fill: ビッグエンディアンの色で埋める (dest, length, color) ---
+
+@micropython.viper
+def fill_viper8(dest, length: int, color: int):
+    d = ptr8(dest)
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    i = 0
+    while i < length:
+        d[i] = hi
+        d[i + 1] = lo
+        i += 2
+
+@micropython.viper
+def fill_viper16(dest, length: int, color: int):
+    d = ptr16(dest)
+    # メモリ上で hi, lo の順になるリトルエンディアンの値
+    v = ((color >> 8) & 0xFF) | ((color & 0xFF) << 8)
+    n = length >> 1
+    i = 0
+    while i < n:
+        d[i] = v
+        i += 1
+
+@micropython.viper
+def fill_viper32(dest, length: int, color: int):
+    d = ptr32(dest)
+    v = ((color >> 8) & 0xFF) | ((color & 0xFF) << 8)
+    w = v | (v << 16)
+    n = length >> 2
+    i = 0
+    while i < n:
+        d[i] = w
+        i += 1
+    if length & 2:
+        d8 = ptr8(dest)
+        d8[length - 2] = (color >> 8) & 0xFF
+        d8[length - 1] = color & 0xFF
+
+# --- expand: 8ビットのパレット番号を RGB565 (BE) に展開 (dest, src, count, palette) ---
+
+@micropython.viper
+def expand_viper8(dest, src, count: int, palette):
+    d = ptr8(dest)
+    s = ptr8(src)
+    p = ptr16(palette)
+    i = 0
+    while i < count:
+        c = int(p[int(s[i])])
+        d[i * 2] = (c >> 8) & 0xFF
+        d[i * 2 + 1] = c & 0xFF
+        i += 1
+
+@micropython.viper
+def expand_viper16(dest, src, count: int, palette):
+    d = ptr16(dest)
+    s = ptr8(src)
+    p = ptr16(palette)
+    i = 0
+    while i < count:
+        c = int(p[int(s[i])])
+        d[i] = ((c >> 8) | (c << 8)) & 0xFFFF
+        i += 1
+
+# --- checksum: 16ビットワード (LE) ごとに h = h * 33 + w (24ビット) ---
+
+@micropython.viper
+def checksum_viper8(src, length: int) -> int:
+    s = ptr8(src)
+    h = 0
+    i = 0
+    while i < length - 1:
+        h = (h * 33 + (int(s[i]) | (int(s[i + 1]) << 8))) & 0xFFFFFF
+        i += 2
+    return h
+
+@micropython.viper
+def checksum_viper16(src, length: int) -> int:
+    s = ptr16(src)
+    n = length >> 1
+    h = 0
+    i = 0
+    while i < n:
+        h = (h * 33 + int(s[i])) & 0xFFFFFF
+        i += 1
+    return h
+
+@micropython.viper
+def checksum_viper32(src, length: int) -> int:
+    s = ptr32(src)
+    n = length >> 2
+    h = 0
+    i = 0
+    while i < n:
+        x = int(s[i])
+        h = (h * 33 + (x & 0xFFFF)) & 0xFFFFFF
+        h = (h * 33 + ((x >> 16) & 0xFFFF)) & 0xFFFFFF
+        i += 1
+    if length & 2:
+        s8 = ptr8(src)
+        i = length & ~3
+        h = (h * 33 + (int(s8[i]) | (int(s8[i + 1]) << 8))) & 0xFFFFFF
+    return h
@@ -0,0 +1,87 @@
+"""
+Multi-game launcher
+Shows a game menu, runs the selected game with the shared runtime and
+unloads the game module afterwards so the heap returns to baseline.
+
+A game is a module with an entry point:
+
+    def run(rt):
+        # rt.display, rt.buttons, rt.buzzer, rt.play_tone
+        ...
+        # return to go back to the launcher
+"""
+
+import gc
+import sys
+import time
+import runtime
+import idle
+
+# (表示名, モジュール名)
+GAMES = [
+    ("FLAPPY BIRD", "flappy_bird"),
+    ("SOAK TEST", "soak"),
+]
+
+# 色定義
+BLACK = 0x0000
+WHITE = 0xFFFF
+YELLOW = 0xFFE0
+
+def draw_menu(display, selected):
+    """ゲーム選択メニューを直接描画"""
+    display.fill_direct(BLACK)
+    display.text_direct("GAMES", 44, 20, YELLOW)
+    for i, (name, _) in enumerate(GAMES):
+        y = 50 + i * 16
+        marker = ">" if i == selected else " "
+        display.text_direct(marker + name, 8, y, WHITE)
+    display.text_direct("A: Start", 32, 140, WHITE)
+
+def menu(rt):
+    """メニューでゲームを選び、そのインデックスを返す"""
+    selected = 0
+    up = rt.buttons["UP"]
+    down = rt.buttons["DOWN"]
+    a = rt.buttons["A"]
+    while True:
+        draw_menu(rt.display, selected)
+        pin = idle.wait_press([up, down, a])
+        if pin is a:
+            return selected
+        if pin is up:
+            selected = (selected - 1) % len(GAMES)
+        else:
+            selected = (selected + 1) % len(GAMES)
+
+def _mem_free():
+    # gc.mem_free がないポート（ホストの CPython）では None
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
+
+def run_game(rt, module_name):
+    """ゲームを読み込んで実行し、終了後にモジュールを解放する"""
+    gc.collect()
+    free_before = _mem_free()
+    loaded = set(sys.modules)
+    start = time.ticks_ms()
+    game = __import__(module_name)
+    print("{}: loaded in {} ms".format(module_name, time.ticks_diff(time.ticks_ms(), start)))
+    try:
+        game.run(rt)
+    finally:
+        # ゲームが読み込んだモジュールをすべて解放
+        del game
+        for name in list(sys.modules):
+            if name not in loaded:
+                del sys.modules[name]
+        rt.clear()
+        gc.collect()
+    free_after = _mem_free()
+    if free_after is not None:
+        print("{}: heap delta {} bytes".format(module_name, free_before - free_after))
+
+def main():
+    rt = runtime.get()
+    while True:
+        index = menu(rt)
+        run_game(rt, GAMES[index][1])
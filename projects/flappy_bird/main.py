@@ -1,8 +1,8 @@
-# main.py - Flappy Bird Game Launcher
-# This file imports and runs the Flappy Bird game
+# main.py - Game Launcher
+# This file starts the launcher, which runs Flappy Bird and other games
 
-import flappy_bird
+import launcher
 
-# Run the game
-print("Starting Flappy Bird...")
-flappy_bird.main()
+# Run the launcher
+print("Starting launcher...")
+launcher.main()
@@ -0,0 +1,145 @@
+"""
+Heap and allocation telemetry
+Samples gc.mem_alloc() around named phases and keeps per-phase
+allocation deltas and high-water marks in a preallocated array, so
+that recording does not allocate by itself.
+
+    PH_FRAME = memtel.phase("flappy.frame", budget=512)
+    memtel.begin(PH_FRAME)
+    ...
+    memtel.end(PH_FRAME)
+    memtel.check()      # AssertionError if a phase exceeded its budget
+
+On CPython gc.mem_alloc() is not available; enable() uses tracemalloc.
+"""
+
+import gc
+import array
+
+# 登録できるフェーズの最大数
+MAX_PHASES = 16
+
+# フェーズごとのフィールド
+COUNT = 0     # end() の回数
+START = 1     # begin() 時の mem_alloc
+LAST = 2      # 直近の割り当て量
+MAX = 3       # 割り当て量の最大値
+TOTAL = 4     # 割り当て量の合計
+BUDGET = 5    # 1回あたりの上限（-1 = なし）
+OVER = 6      # 上限を超えた回数
+PEAK = 7      # フェーズ終了時の mem_alloc の最大値（ハイウォーターマーク）
+FIELDS = 8
+
+_stats = array.array("i", [0] * (MAX_PHASES * FIELDS))
+_names = []
+
+if hasattr(gc, "mem_alloc"):
+    _mem_alloc = gc.mem_alloc
+    enabled = True
+else:
+    _mem_alloc = None
+    enabled = False
+
+def _traced_alloc():
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[0]
+
+def enable():
+    """計測を有効にする（CPythonでは tracemalloc を開始）"""
+    global enabled, _mem_alloc
+    if _mem_alloc is None:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _mem_alloc = _traced_alloc
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+
+def phase(name, budget=-1):
+    """フェーズを登録してIDを返す（同じ名前なら同じID）"""
+    if name in _names:
+        pid = _names.index(name)
+    else:
+        if len(_names) >= MAX_PHASES:
+            raise ValueError("too many phases")
+        pid = len(_names)
+        _names.append(name)
+    base = pid * FIELDS
+    for i in range(FIELDS):
+        _stats[base + i] = 0
+    _stats[base + BUDGET] = budget
+    return pid
+
+def begin(pid):
+    if enabled:
+        _stats[pid * FIELDS + START] = _mem_alloc()
+
+def end(pid):
+    """フェーズを終了し、その間の割り当て量を返す"""
+    if not enabled:
+        return 0
+    now = _mem_alloc()
+    base = pid * FIELDS
+    delta = now - _stats[base + START]
+    _stats[base + COUNT] += 1
+    _stats[base + LAST] = delta
+    _stats[base + TOTAL] += delta
+    if delta > _stats[base + MAX]:
+        _stats[base + MAX] = delta
+    budget = _stats[base + BUDGET]
+    if budget >= 0 and delta > budget:
+        _stats[base + OVER] += 1
+    if now > _stats[base + PEAK]:
+        _stats[base + PEAK] = now
+    return delta
+
+def get(name):
+    """フェーズの統計を辞書で返す"""
+    base = _names.index(name) * FIELDS
+    return {
+        "count": _stats[base + COUNT],
+        "last": _stats[base + LAST],
+        "max": _stats[base + MAX],
+        "total": _stats[base + TOTAL],
+        "budget": _stats[base + BUDGET],
+        "over": _stats[base + OVER],
+        "peak": _stats[base + PEAK],
+    }
+
+def reset():
+    """統計をクリア（登録と上限はそのまま）"""
+    for pid in range(len(_names)):
+        base = pid * FIELDS
+        for i in (COUNT, LAST, MAX, TOTAL, OVER, PEAK):
+            _stats[base + i] = 0
+
+def over_budget():
+    """上限を超えたフェーズの (名前, 最大割り当て量, 上限) のリスト"""
+    result = []
+    for pid, name in enumerate(_names):
+        base = pid * FIELDS
+        if _stats[base + OVER]:
+            result.append((name, _stats[base + MAX], _stats[base + BUDGET]))
+    return result
+
+def check():
+    """上限を超えたフェーズがあれば AssertionError"""
+    over = over_budget()
+    if over:
+        raise AssertionError("allocation budget exceeded: " + ", ".join(
+            "{} {} > {}".format(name, peak, budget) for name, peak, budget in over))
+
+def report():
+    """フェーズごとの統計を表示"""
+    print("{:<16s} {:>6s} {:>7s} {:>7s} {:>7s} {:>5s} {:>8s}".format(
+        "phase", "count", "last", "max", "budget", "over", "peak"))
+    for pid, name in enumerate(_names):
+        base = pid * FIELDS
+        if not _stats[base + COUNT]:
+            continue
+        print("{:<16s} {:>6d} {:>7d} {:>7d} {:>7d} {:>5d} {:>8d}".format(
+            name, _stats[base + COUNT], _stats[base + LAST], _stats[base + MAX],
+            _stats[base + BUDGET], _stats[base + OVER], _stats[base + PEAK]))
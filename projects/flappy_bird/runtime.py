@@ -0,0 +1,99 @@
+"""
+Shared hardware runtime for games
+Owns the single display, button and buzzer instances so that games
+do not re-initialize the panel or allocate their own frame buffers.
+"""
+
+from machine import Pin, SPI, PWM
+import time
+import st7735
+import store
+import inputscan
+import assets
+
+# ハイスコアと設定の保存先
+STORE_PATH = "store.dat"
+
+# ボタンのGPIO割り当て（HARDWARE.md参照）
+BUTTON_PINS = {
+    "UP": 23,
+    "DOWN": 26,
+    "LEFT": 21,
+    "RIGHT": 27,
+    "A": 28,
+    "B": 29,
+    "START": 11,
+    "SELECT": 10,
+}
+
+# ゲームは縦長 128x160 の画面を前提にしているので縦向きの回転だけを使う
+PORTRAIT_ROTATIONS = (0, 180)
+DEFAULT_ROTATION = 180
+
+def make_display(spi, cs, dc, rst, cfg):
+    """保存済みのキャリブレーション（bgr, xoff, yoff, rot）でディスプレイを作る"""
+    rotation = cfg.get("rot", DEFAULT_ROTATION)
+    if rotation not in PORTRAIT_ROTATIONS:
+        # 90/270 は 160x128 になり、128x160 のまま送ると GRAM の範囲を超える
+        print("runtime: rotation {} not supported, using {}".format(rotation, DEFAULT_ROTATION))
+        rotation = DEFAULT_ROTATION
+    # Some ST7735 modules use BGR byte order. If your display shows
+    # a strong blue tint, set bgr=False to use RGB ordering.
+    # xoffset=2, yoffset=1 で右端と下端のランダムドットを修正
+    display = st7735.ST7735(spi, cs=cs, dc=dc, rst=rst, width=128, height=160,
+                            bgr=bool(cfg.get("bgr", 0)),
+                            xoffset=cfg.get("xoff", 2), yoffset=cfg.get("yoff", 1),
+                            rotation=rotation)
+    display.init()
+    return display
+
+class Runtime:
+    def __init__(self):
+        # ハイスコアとユニットごとのディスプレイ設定（起動時にインデックスを作成）
+        self.store = store.RecordStore(STORE_PATH)
+
+        # ディスプレイ用SPI設定（ST7735S）
+        spi = SPI(0, baudrate=20000000, polarity=0, phase=0,
+                  sck=Pin(2), mosi=Pin(3))
+        cs = Pin(6, Pin.OUT)
+        dc = Pin(5, Pin.OUT)
+        rst = Pin(4, Pin.OUT)
+        # BL(バックライト)はVCCに接続
+
+        # 保存済みのキャリブレーションがあればそれを使う
+        self.display = make_display(spi, cs, dc, rst, self.store)
+        # 画像アセットのチャンクバッファは起動時に確保（タイトル画面で割り当てない）
+        assets.reserve()
+
+        # ボタン設定（押下で0）。input.update() で全ボタンを一度に読む
+        # buttons は idle.wait_press() の IRQ 用の Pin
+        self.input = inputscan.Scanner(BUTTON_PINS)
+        self.buttons = self.input.pins
+
+        # ブザー設定
+        self.buzzer = PWM(Pin(0))
+
+    def play_tone(self, frequency, duration):
+        """ブザーで音を鳴らす"""
+        try:
+            self.buzzer.freq(frequency)
+            self.buzzer.duty_u16(32768)  # 50% duty cycle
+            time.sleep_ms(duration)
+            self.buzzer.duty_u16(0)
+        except Exception:
+            pass
+
+    def clear(self):
+        """画面とフレームバッファを黒で消去"""
+        self.display.fill(st7735.BLACK)
+        self.display.fill_direct(st7735.BLACK)
+
+# 共有インスタンス（最初の get() で初期化）
+_runtime = None
+
+def get():
+    """共有ランタイムを返す（ディスプレイの初期化は一度だけ）"""
+    global _runtime
+    if _runtime is None:
+        _runtime = Runtime()
+    return _runtime
@@ -0,0 +1,263 @@
+"""
+Retained-mode scene list with overdraw elimination
+Drawing calls are recorded instead of painted. render() walks each row
+from the top-most item down, computes the spans that are still
+uncovered and writes every visible pixel exactly once into the
+display framebuffer. The result is identical to painting the items in
+submission order.
+
+Scene has the same drawing methods as ST7735 (fill, fill_rect, rect,
+hline, vline, text) so game drawing code can target either of them.
+An optional z argument puts an item above lower z values; items with
+the same z keep painter's order.
+
+Items, the draw order and the covered spans of the current row live in
+arrays allocated once in the constructor, so clear() / drawing /
+render() do not allocate per frame. `capacity` bounds the number of
+items per frame.
+"""
+
+import array
+import framebuf
+import micropython
+
+RECT = 0
+TEXT = 1
+SPRITE = 2
+
+# ASCII 32〜127 のグリフ（1文字8バイト、1行1バイトのMONO_HLSB）。初めて使うときに作る
+_glyphs = bytearray(96 * 8)
+_glyph_ready = bytearray(96)
+_glyph_buf = bytearray(8)
+_glyph_fbuf = framebuf.FrameBuffer(_glyph_buf, 8, 8, framebuf.MONO_HLSB)
+
+def _glyph(ch):
+    """文字のグリフの _glyphs 内の位置（framebuf と同じく範囲外の文字は 127）"""
+    c = ord(ch)
+    if c < 32 or c > 127:
+        c = 127
+    c -= 32
+    if not _glyph_ready[c]:
+        _glyph_fbuf.fill(0)
+        _glyph_fbuf.text(chr(c + 32), 0, 0, 1)
+        for r in range(8):
+            _glyphs[c * 8 + r] = _glyph_buf[r]
+        _glyph_ready[c] = 1
+    return c * 8
+
+# Viperネイティブコードでスプライトの行をコピー（スライスを作らない）
+@micropython.viper
+def _copy(dst, dst_pos: int, src, src_pos: int, count: int):
+    d = ptr8(dst)
+    s = ptr8(src)
+    i = 0
+    while i < count:
+        d[dst_pos + i] = s[src_pos + i]
+        i += 1
+
+class Scene:
+    def __init__(self, display, capacity=64):
+        """
+        Args:
+            display: ST7735 (buffer, fbuf, width, height)
+            capacity: maximum number of items per frame
+        """
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.capacity = capacity
+        self.count = 0
+        # 項目ごとの値（z、種類、位置、大きさ、色、文字列やスプライト）
+        self._z = array.array("h", [0] * capacity)
+        self._kind = bytearray(capacity)
+        self._x = array.array("h", [0] * capacity)
+        self._y = array.array("h", [0] * capacity)
+        self._w = array.array("h", [0] * capacity)
+        self._h = array.array("h", [0] * capacity)
+        self._color = array.array("i", [0] * capacity)
+        self._data = [None] * capacity
+        # 手前から奥への描画順
+        self._order = array.array("h", [0] * capacity)
+        # 描画中の行で覆われた区間 [a0, b0, a1, b1, ...]（重ならず、隣接もしない）
+        self._covered = array.array("h", [0] * (display.width + 2))
+        self._ncovered = 0
+        # 直近の render() の統計
+        self.pixels_written = 0
+        self.pixels_painted = 0
+
+    def clear(self):
+        self.count = 0
+
+    def _add(self, z, kind, x, y, w, h, color, data):
+        i = self.count
+        if i >= self.capacity:
+            raise ValueError("scene is full")
+        self._z[i] = z
+        self._kind[i] = kind
+        self._x[i] = x
+        self._y[i] = y
+        self._w[i] = w
+        self._h[i] = h
+        self._color[i] = color
+        self._data[i] = data
+        self.count = i + 1
+
+    # --- 描画コマンド（ST7735 と同じ引数） ---
+    def fill_rect(self, x, y, w, h, color, z=0):
+        if w > 0 and h > 0:
+            self._add(z, RECT, x, y, w, h, color, None)
+
+    def hline(self, x, y, w, color, z=0):
+        self.fill_rect(x, y, w, 1, color, z)
+
+    def vline(self, x, y, h, color, z=0):
+        self.fill_rect(x, y, 1, h, color, z)
+
+    def rect(self, x, y, w, h, color, z=0):
+        # FrameBuffer.rect と同じ順序で4辺を描く
+        self.fill_rect(x, y, w, 1, color, z)
+        self.fill_rect(x, y + h - 1, w, 1, color, z)
+        self.fill_rect(x, y, 1, h, color, z)
+        self.fill_rect(x + w - 1, y, 1, h, color, z)
+
+    def fill(self, color, z=0):
+        self.fill_rect(0, 0, self.width, self.height, color, z)
+
+    def text(self, string, x, y, color, z=0):
+        if string:
+            self._add(z, TEXT, x, y, len(string) * 8, 8, color, string)
+
+    def sprite(self, buf, x, y, w, h, key=-1, z=0):
+        """RGB565 スプライト（リトルエンディアン、幅 w 高さ h）。key 色は透明"""
+        self._add(z, SPRITE, x, y, w, h, key, buf)
+
+    # --- 描画 ---
+    def _write(self, i, row, g0, g1):
+        """項目 i の row 行目 [g0, g1) をフレームバッファに書き込む"""
+        self.pixels_written += g1 - g0
+        if self._kind[i] == SPRITE:
+            src = ((row - self._y[i]) * self._w[i] + g0 - self._x[i]) * 2
+            _copy(self.display.buffer, (row * self.width + g0) * 2, self._data[i], src, (g1 - g0) * 2)
+        else:
+            self.display.fbuf.hline(g0, row, g1 - g0, self._color[i])
+
+    def _span(self, i, row, x0, x1):
+        """項目 i の不透明な区間 [x0, x1) のうち未描画の部分を書き込み、覆われた区間に加える"""
+        if x0 < 0:
+            x0 = 0
+        if x1 > self.width:
+            x1 = self.width
+        if x0 >= x1:
+            return
+        self.pixels_painted += x1 - x0
+        cov = self._covered
+        n = self._ncovered
+        # x0 より手前で終わる区間を飛ばす
+        k = 0
+        while k < n and cov[2 * k + 1] < x0:
+            k += 1
+        first = k
+        # [x0, x1) と重なる（接する）区間の間のすきまだけを書き込む
+        pos = x0
+        lo = x0
+        hi = x1
+        while k < n and cov[2 * k] <= x1:
+            a = cov[2 * k]
+            b = cov[2 * k + 1]
+            if a > pos:
+                self._write(i, row, pos, a)
+            if b > pos:
+                pos = b
+            if a < lo:
+                lo = a
+            if b > hi:
+                hi = b
+            k += 1
+        if pos < x1:
+            self._write(i, row, pos, x1)
+        # first..k-1 の区間を [lo, hi) の1つに置き換える
+        removed = k - first
+        if removed == 0:
+            m = n
+            while m > first:
+                cov[2 * m] = cov[2 * m - 2]
+                cov[2 * m + 1] = cov[2 * m - 1]
+                m -= 1
+        elif removed > 1:
+            m = k
+            while m < n:
+                cov[2 * (m - removed + 1)] = cov[2 * m]
+                cov[2 * (m - removed + 1) + 1] = cov[2 * m + 1]
+                m += 1
+        cov[2 * first] = lo
+        cov[2 * first + 1] = hi
+        self._ncovered = n - removed + 1
+
+    def _row(self, i, row):
+        """項目 i の row 行目の不透明な区間を _span に渡す"""
+        kind = self._kind[i]
+        x = self._x[i]
+        if kind == RECT:
+            self._span(i, row, x, x + self._w[i])
+        elif kind == TEXT:
+            r = row - self._y[i]
+            for ch in self._data[i]:
+                bits = _glyphs[_glyph(ch) + r]
+                b = 0
+                while b < 8:
+                    if bits & (0x80 >> b):
+                        start = b
+                        while b < 8 and bits & (0x80 >> b):
+                            b += 1
+                        self._span(i, row, x + start, x + b)
+                    else:
+                        b += 1
+                x += 8
+        else:
+            buf = self._data[i]
+            key = self._color[i]
+            w = self._w[i]
+            base = (row - self._y[i]) * w * 2
+            p = 0
+            while p < w:
+                c = buf[base + p * 2] | (buf[base + p * 2 + 1] << 8)
+                if c == key:
+                    p += 1
+                    continue
+                start = p
+                p += 1
+                while p < w and (buf[base + p * 2] | (buf[base + p * 2 + 1] << 8)) != key:
+                    p += 1
+                self._span(i, row, x + start, x + p)
+
+    def render(self):
+        """シーンをフレームバッファに描画（各ピクセルは1回だけ書き込む）"""
+        n = self.count
+        z = self._z
+        ys = self._y
+        hs = self._h
+        order = self._order
+        cov = self._covered
+        width = self.width
+        # 手前（z が大きい、同じ z なら後に追加した）順に並べる（挿入ソート）
+        for o in range(n):
+            item = n - 1 - o
+            j = o
+            while j > 0 and z[order[j - 1]] < z[item]:
+                order[j] = order[j - 1]
+                j -= 1
+            order[j] = item
+        self.pixels_written = 0
+        self.pixels_painted = 0
+        for row in range(self.height):
+            self._ncovered = 0
+            for o in range(n):
+                i = order[o]
+                y = ys[i]
+                if row < y or row >= y + hs[i]:
+                    continue
+                self._row(i, row)
+                if self._ncovered == 1 and cov[0] == 0 and cov[1] == width:
+                    # この行はすべて描画済み
+                    break
+        return self.pixels_written
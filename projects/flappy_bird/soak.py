@@ -0,0 +1,149 @@
+"""
+Headless soak test for flappy bird
+Plays many games back to back with an autopilot and no frame pacing,
+and logs frame rate, the longest frame, gc.mem_free and the largest
+free heap block so that builds can be compared.
+
+On the board:  import soak; soak.run(runtime.get(), games=100)
+On the host:   python tools/soak_host.py
+"""
+
+import gc
+import time
+import random
+import flappy_bird
+import memtel
+
+class Autopilot:
+    """パイプの隙間の位置からジャンプを決める（フレーム時間も計測）"""
+
+    def __init__(self, max_frames):
+        self.max_frames = max_frames
+        self.frames = 0
+        self.longest_us = 0
+        self._last = None
+
+    def __call__(self, bird, pipes):
+        now = time.ticks_us()
+        if self._last is not None:
+            dt = time.ticks_diff(now, self._last)
+            if dt > self.longest_us:
+                self.longest_us = dt
+        self._last = now
+        self.frames += 1
+        if self.frames > self.max_frames:
+            # 打ち切り: ジャンプをやめて地面に落とす
+            return False
+        # 鳥の前にある最初のパイプを目標にする
+        target = pipes[0]
+        for pipe in pipes:
+            if pipe.x + pipe.width >= bird.x:
+                target = pipe
+                break
+        gap_bottom = target.gap_y + flappy_bird.PIPE_GAP
+        # 次のフレームで隙間の下端に近づきすぎるならジャンプ
+        next_y = bird.y + bird.velocity + flappy_bird.GRAVITY
+        return bird.velocity >= 0 and next_y + bird.size > gap_bottom - 6
+
+def largest_block():
+    """確保できる最大の連続ブロック (bytes)。MicroPython以外では None"""
+    if not hasattr(gc, "mem_free"):
+        return None
+    gc.collect()
+    lo = 0
+    hi = gc.mem_free()
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        try:
+            block = bytearray(mid)
+            del block
+            lo = mid
+        except MemoryError:
+            hi = mid - 1
+    return lo
+
+def mem_free():
+    if not hasattr(gc, "mem_free"):
+        return None
+    gc.collect()
+    return gc.mem_free()
+
+def _fmt(value):
+    return "-" if value is None else str(value)
+
+def _trend(values):
+    """(開始, 終了, 最小) を "開始->終了 min=最小" 形式に"""
+    if values[0] is None:
+        return "-"
+    return "{}->{} min={}".format(*values)
+
+def run(rt, games=20, max_frames=3000, seed=1, log_every=1):
+    """
+    ソークテストを実行して要約を返す
+    
+    Args:
+        rt: runtime (only rt.display is used)
+        games: number of games to play
+        max_frames: frames after which the autopilot gives up a game
+        seed: random seed for the pipe gaps
+        log_every: print a progress line every N games (0 = summary only)
+    """
+    flappy_bird.display = rt.display
+    flappy_bird.sound_enabled = False
+    random.seed(seed)
+
+    free_start = mem_free()
+    block_start = largest_block()
+    total_frames = 0
+    total_us = 0
+    total_score = 0
+    longest_us = 0
+    block_min = block_start
+    free_min = free_start
+    try:
+        for game in range(1, games + 1):
+            pilot = Autopilot(max_frames)
+            start = time.ticks_us()
+            memtel.begin(flappy_bird.PH_GAME)
+            score = flappy_bird.main_game(pilot, 0)
+            memtel.end(flappy_bird.PH_GAME)
+            elapsed = time.ticks_diff(time.ticks_us(), start)
+            total_frames += pilot.frames
+            total_us += elapsed
+            total_score += score
+            if pilot.longest_us > longest_us:
+                longest_us = pilot.longest_us
+            free = mem_free()
+            block = largest_block()
+            if free is not None:
+                free_min = min(free_min, free)
+                block_min = min(block_min, block)
+            if log_every and game % log_every == 0:
+                print("soak game={} score={} frames={} fps={:.1f} max_ms={:.1f} free={} block={}".format(
+                    game, score, pilot.frames, pilot.frames * 1000000 / max(elapsed, 1),
+                    pilot.longest_us / 1000, _fmt(free), _fmt(block)))
+    finally:
+        flappy_bird.sound_enabled = True
+
+    free_end = mem_free()
+    block_end = largest_block()
+    summary = {
+        "games": games,
+        "frames": total_frames,
+        "fps": total_frames * 1000000 / max(total_us, 1),
+        "max_ms": longest_us / 1000,
+        "score": total_score / games,
+        "free": (free_start, free_end, free_min),
+        "block": (block_start, block_end, block_min),
+    }
+    # ビルド間で比較しやすい1行の要約
+    print("SOAK games={} frames={} fps={:.1f} max_ms={:.1f} avg_score={:.1f} free={} block={}".format(
+        games, total_frames, summary["fps"], summary["max_ms"], summary["score"],
+        _trend(summary["free"]), _trend(summary["block"])))
+    if memtel.enabled:
+        memtel.report()
+    return summary
+
+if __name__ == "__main__":
+    import runtime
+    run(runtime.get())
@@ -0,0 +1,230 @@
+"""
+Sprite variant cache
+Rotated, flipped and scaled versions of RGB565 sprites are generated on
+demand by a viper kernel and kept in a fixed RAM budget, evicting the
+least recently used variant when the budget is full.
+
+    BIRD = sprites.Sprite(buf, 8, 8)
+    cache = sprites.SpriteCache(budget=2048)
+    cache.draw(display, BIRD, x, y, rotation=2)   # 2 steps = 45 degrees
+
+Rotation is quantized to `steps` angles per turn (clockwise), scale is
+an integer factor. Pixels outside the rotated sprite get the key color,
+which draw() treats as transparent.
+
+With masks=True every variant also gets a collision.Mask of its opaque
+pixels, placed at the same (x + ox, y + oy) as the drawn variant.
+"""
+
+import math
+import time
+import array
+import framebuf
+import micropython
+from micropython import const
+import collision
+
+# 透明色（スプライトに使わない色）
+KEY = 0xF81F
+
+# 回転の分割数（1ステップ = 360 / STEPS 度）
+STEPS = 16
+
+# 最大の拡大率
+MAX_SCALE = 8
+
+# cos/sin を正の値で渡すための下駄。ホストのスタンドインの ptr32 は符号なしで読み、
+# MicroPython の viper は int() で符号付きとして読むが、正の値ならどちらも同じになる
+_BIAS = const(0x20000)
+
+# Viperネイティブコードで回転・反転・拡大（出力ピクセルから元のピクセルを逆算）
+@micropython.viper
+def _transform(src, dst, p) -> int:
+    """p = [sw, sh, dw, dh, cos, sin, flip_x, flip_y, key]、不透明なピクセル数を返す"""
+    s = ptr16(src)
+    d = ptr16(dst)
+    q = ptr32(p)
+    sw = int(q[0])
+    sh = int(q[1])
+    dw = int(q[2])
+    dh = int(q[3])
+    c = int(q[4]) - _BIAS
+    sn = int(q[5]) - _BIAS
+    fx = int(q[6])
+    fy = int(q[7])
+    key = int(q[8])
+    # 座標は半ピクセル単位、cos/sin は 1/拡大率 を掛けた 16.16 固定小数点
+    ox = sw << 16
+    oy = sh << 16
+    opaque = 0
+    i = 0
+    ry = 1 - dh
+    while ry < dh:
+        rx = 1 - dw
+        while rx < dw:
+            sx = (rx * c + ry * sn + ox) >> 17
+            sy = (ry * c - rx * sn + oy) >> 17
+            if sx >= 0 and sx < sw and sy >= 0 and sy < sh:
+                if fx:
+                    sx = sw - 1 - sx
+                if fy:
+                    sy = sh - 1 - sy
+                v = int(s[sy * sw + sx])
+                d[i] = v
+                if v != key:
+                    opaque += 1
+            else:
+                d[i] = key
+            i += 1
+            rx += 2
+        ry += 2
+    return opaque
+
+class Sprite:
+    _count = 0
+
+    def __init__(self, buf, width, height, key=KEY):
+        """
+        Args:
+            buf: RGB565 pixels in framebuf layout (little-endian, width * height)
+            width, height: size in pixels
+            key: transparent color
+        """
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.key = key
+        # キャッシュのキーに使う番号
+        self.id = Sprite._count
+        Sprite._count += 1
+
+class Variant:
+    def __init__(self, buf, width, height, ox, oy):
+        self.buf = buf
+        self.width = width
+        self.height = height
+        # 元のスプライト（拡大後）の左上からのずれ（中心を合わせる）
+        self.ox = ox
+        self.oy = oy
+        self.fbuf = framebuf.FrameBuffer(buf, width, height, framebuf.RGB565)
+        # 当たり判定マスク（SpriteCache(masks=True) のときだけ）
+        self.mask = None
+        self.last = 0
+
+class SpriteCache:
+    def __init__(self, budget=4096, steps=STEPS, masks=False):
+        """
+        Args:
+            budget: bytes of pixel data kept for variants
+            steps: rotation steps per full turn
+            masks: also build a collision mask for each variant
+        """
+        self.budget = budget
+        self.steps = steps
+        self.masks = masks
+        self.used = 0
+        self._variants = {}
+        self._tick = 0
+        self._params = array.array("i", [0] * 9)
+        # 統計
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.gen_us = 0
+        self.gen_max_us = 0
+
+    def _key(self, sprite, rotation, flip_x, flip_y, scale):
+        return (((sprite.id * self.steps + rotation) * 4 + (2 if flip_y else 0) + (1 if flip_x else 0))
+                * MAX_SCALE + scale - 1)
+
+    def _make(self, sprite, rotation, flip_x, flip_y, scale):
+        """変換したバリエーションを生成"""
+        angle = 2 * math.pi * rotation / self.steps
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        w = sprite.width * scale
+        h = sprite.height * scale
+        dw = int(math.ceil(w * abs(cos) + h * abs(sin) - 1e-6))
+        dh = int(math.ceil(w * abs(sin) + h * abs(cos) - 1e-6))
+        size = dw * dh * 2
+        if size > self.budget:
+            raise ValueError("variant larger than the cache budget")
+        self._evict(size)
+        buf = bytearray(size)
+        p = self._params
+        p[0] = sprite.width
+        p[1] = sprite.height
+        p[2] = dw
+        p[3] = dh
+        p[4] = round(cos * 65536 / scale) + _BIAS
+        p[5] = round(sin * 65536 / scale) + _BIAS
+        p[6] = 1 if flip_x else 0
+        p[7] = 1 if flip_y else 0
+        p[8] = sprite.key
+        start = time.ticks_us()
+        _transform(sprite.buf, buf, p)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self.gen_us += elapsed
+        if elapsed > self.gen_max_us:
+            self.gen_max_us = elapsed
+        self.used += size
+        variant = Variant(buf, dw, dh, (w - dw) // 2, (h - dh) // 2)
+        if self.masks:
+            variant.mask = collision.Mask.from_rgb565(buf, dw, dh, sprite.key)
+        return variant
+
+    def _evict(self, size):
+        """size バイト空くまで最も長く使われていないものを捨てる"""
+        variants = self._variants
+        while self.used + size > self.budget and variants:
+            oldest = None
+            oldest_tick = self._tick + 1
+            for key, variant in variants.items():
+                if variant.last < oldest_tick:
+                    oldest = key
+                    oldest_tick = variant.last
+            self.used -= len(variants.pop(oldest).buf)
+            self.evictions += 1
+
+    def get(self, sprite, rotation=0, flip_x=False, flip_y=False, scale=1):
+        """バリエーションを返す（なければ生成してキャッシュ）"""
+        rotation %= self.steps
+        if not 1 <= scale <= MAX_SCALE:
+            raise ValueError("scale must be 1.." + str(MAX_SCALE))
+        key = self._key(sprite, rotation, flip_x, flip_y, scale)
+        self._tick += 1
+        variant = self._variants.get(key)
+        if variant is None:
+            self.misses += 1
+            variant = self._make(sprite, rotation, flip_x, flip_y, scale)
+            self._variants[key] = variant
+        else:
+            self.hits += 1
+        variant.last = self._tick
+        return variant
+
+    def draw(self, target, sprite, x, y, rotation=0, flip_x=False, flip_y=False, scale=1):
+        """(x, y) を拡大後のスプライトの左上として、回転の中心を合わせて描画"""
+        v = self.get(sprite, rotation, flip_x, flip_y, scale)
+        fbuf = getattr(target, "fbuf", None)
+        if fbuf is not None:
+            # ST7735: フレームバッファに直接（フレーム中に割り当てない）
+            fbuf.blit(v.fbuf, x + v.ox, y + v.oy, sprite.key)
+        else:
+            # Scene などスプライトを登録するもの
+            target.sprite(v.buf, x + v.ox, y + v.oy, v.width, v.height, sprite.key)
+
+    def clear(self):
+        self._variants = {}
+        self.used = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+    def report(self):
+        misses = max(self.misses, 1)
+        print("sprites variants={} used={}/{} hits={} misses={} evictions={} hit_rate={:.3f} "
+              "gen_avg_us={} gen_max_us={}".format(
+            len(self._variants), self.used, self.budget, self.hits, self.misses, self.evictions,
+            self.hit_rate(), self.gen_us // misses, self.gen_max_us))
@@ -0,0 +1,136 @@
+"""
+Append-only record store for high scores and settings
+Keeps an in-RAM index and appends fixed-size binary records to a log
+file on flash. The log is compacted only when it grows past a limit.
+
+Record layout (12 bytes):
+    marker (u8) | checksum (u8) | key (6 bytes ASCII) | value (i32 BE)
+"""
+
+import os
+import struct
+
+RECORD = ">BB6si"
+RECORD_SIZE = 12
+MARKER = 0xA5
+KEY_SIZE = 6
+
+# ログがこのサイズを超えたら書き直す（バイト）
+COMPACT_SIZE = 4096
+
+# 起動時の読み込みで一度に読むレコード数
+LOAD_RECORDS = 32
+
+def _checksum(buf, offset):
+    total = 0
+    for i in range(offset + 2, offset + RECORD_SIZE):
+        total += buf[i]
+    return total & 0xFF
+
+class RecordStore:
+    def __init__(self, path="store.dat", compact_size=COMPACT_SIZE):
+        self.path = path
+        self.compact_size = compact_size
+        # キー -> 値（ファイルに書き込み済み）
+        self._index = {}
+        # キー -> 値（flush() 待ち）
+        self._pending = {}
+        # ログファイルの有効なサイズ
+        self._size = 0
+        # 末尾が壊れている（書き込み中の電源断など）
+        self._damaged = False
+        self.load()
+
+    def load(self):
+        """ログを先頭から読み、RAM上のインデックスを作る"""
+        self._index = {}
+        self._size = 0
+        self._damaged = False
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        buf = bytearray(RECORD_SIZE * LOAD_RECORDS)
+        with f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                offset = 0
+                while offset + RECORD_SIZE <= n:
+                    marker, check, key, value = struct.unpack_from(RECORD, buf, offset)
+                    if marker != MARKER or check != _checksum(buf, offset):
+                        self._damaged = True
+                        return
+                    self._index[key.rstrip(b"\0").decode()] = value
+                    self._size += RECORD_SIZE
+                    offset += RECORD_SIZE
+                if offset != n:
+                    # 途中で切れたレコード
+                    self._damaged = True
+                    return
+
+    def get(self, key, default=None):
+        if key in self._pending:
+            return self._pending[key]
+        return self._index.get(key, default)
+
+    def set(self, key, value):
+        """値を設定する（書き込みは flush() まで遅延）"""
+        if len(key) > KEY_SIZE:
+            raise ValueError("key too long: " + key)
+        if self.get(key) == value:
+            return
+        self._pending[key] = value
+
+    def pending(self):
+        """flush() 待ちのレコード数"""
+        return len(self._pending)
+
+    def keys(self):
+        keys = list(self._index)
+        for key in self._pending:
+            if key not in self._index:
+                keys.append(key)
+        return keys
+
+    def _pack(self, items):
+        buf = bytearray(RECORD_SIZE * len(items))
+        offset = 0
+        for key, value in items:
+            struct.pack_into(RECORD, buf, offset, MARKER, 0, key.encode(), value)
+            buf[offset + 1] = _checksum(buf, offset)
+            offset += RECORD_SIZE
+        return buf
+
+    def flush(self):
+        """保留中のレコードをログに追記する（アイドル画面で呼ぶ）"""
+        if not self._pending:
+            return
+        items = list(self._pending.items())
+        self._pending = {}
+        for key, value in items:
+            self._index[key] = value
+        if self._damaged or self._size + RECORD_SIZE * len(items) > self.compact_size:
+            self.compact()
+            return
+        with open(self.path, "ab") as f:
+            f.write(self._pack(items))
+        self._size += RECORD_SIZE * len(items)
+
+    def compact(self):
+        """最新の値だけでログを書き直す"""
+        self._index.update(self._pending)
+        self._pending = {}
+        tmp = self.path + ".tmp"
+        data = self._pack(list(self._index.items()))
+        with open(tmp, "wb") as f:
+            f.write(data)
+        try:
+            os.rename(tmp, self.path)
+        except OSError:
+            # 上書きできないファイルシステム
+            os.remove(self.path)
+            os.rename(tmp, self.path)
+        self._size = len(data)
+        self._damaged = False
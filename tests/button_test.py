@@ -1,27 +1,29 @@
 """
 Button Pin Assignment Test Program
 Press each button to see the result in serial console
+All buttons are read at once from the GPIO_IN register (inputscan.py)
 """
 from machine import Pin
 import time
+import inputscan
 
 # Button pin assignments (based on HARDWARE.md)
-buttons = {
-    'UP': Pin(23, Pin.IN, Pin.PULL_UP),
-    'DOWN': Pin(26, Pin.IN, Pin.PULL_UP),
-    'LEFT': Pin(21, Pin.IN, Pin.PULL_UP),
-    'RIGHT': Pin(27, Pin.IN, Pin.PULL_UP),
-    'A': Pin(28, Pin.IN, Pin.PULL_UP),
-    'B': Pin(29, Pin.IN, Pin.PULL_UP),
-    'START': Pin(11, Pin.IN, Pin.PULL_UP),
-    'SELECT': Pin(10, Pin.IN, Pin.PULL_UP),
-}
+scanner = inputscan.Scanner({
+    'UP': 23,
+    'DOWN': 26,
+    'LEFT': 21,
+    'RIGHT': 27,
+    'A': 28,
+    'B': 29,
+    'START': 11,
+    'SELECT': 10,
+})
+buttons = scanner.pins
 
 # Onboard LED for visual feedback
 led = Pin(25, Pin.OUT)
 
-# Track previous button states (for debouncing)
-last_state = {name: 1 for name in buttons.keys()}
+# Track last press time (for debouncing)
 last_press_time = {name: 0 for name in buttons.keys()}
 
 # Debounce delay in milliseconds
@@ -36,6 +38,7 @@ print("Button assignments:")
 for name, pin in buttons.items():
     print("  {:<8s}: GPIO {}".format(name, pin))
 print("-" * 40)
+print("Input: " + ("GPIO_IN register" if scanner.direct else "Pin.value() fallback"))
 print("Press Ctrl+C to exit")
 print("=" * 40)
 print()
@@ -44,22 +47,21 @@ try:
     while True:
         current_time = time.ticks_ms()
         
-        for name, button in buttons.items():
-            current_state = button.value()
-            
-            # Detect button press (1->0 transition)
-            if last_state[name] == 1 and current_state == 0:
+        # One register read for all buttons, edges as bitmasks
+        scanner.update()
+        
+        # Detect button press (1->0 transition)
+        if scanner.pressed:
+            for name in scanner.names(scanner.pressed):
                 # Debounce: check if enough time has passed since last press
                 if time.ticks_diff(current_time, last_press_time[name]) > DEBOUNCE_MS:
-                    print("[OK] {:<8s} button pressed (GPIO {})".format(name, button))
+                    print("[OK] {:<8s} button pressed (GPIO {})".format(name, buttons[name]))
                     led.on()  # Turn on LED
                     last_press_time[name] = current_time
-            
-            # Detect button release (0->1 transition)
-            elif last_state[name] == 0 and current_state == 1:
-                led.off()  # Turn off LED
-            
-            last_state[name] = current_state
+        
+        # Detect button release (0->1 transition)
+        if scanner.released:
+            led.off()  # Turn off LED
         
         time.sleep_ms(10)  # Reduce CPU load
 
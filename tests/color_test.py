@@ -25,39 +25,37 @@ def color_test_screen(display, btn_a):
     
     SCREEN_WIDTH = 128
     
-    display.fill(BLACK)
-    
+    # 静的な画面なのでフレームバッファを使わず直接描画
     # カラーバーを表示（上から順に）
     bar_height = 25
     
     # 赤
-    display.fill_rect(0, 0, SCREEN_WIDTH, bar_height, RED)
-    display.text("RED", 50, 8, WHITE)
+    display.fill_rect_direct(0, 0, SCREEN_WIDTH, bar_height, RED)
+    display.text_direct("RED", 50, 8, WHITE, RED)
     
     # 緑
-    display.fill_rect(0, bar_height, SCREEN_WIDTH, bar_height, GREEN)
-    display.text("GREEN", 45, bar_height + 8, WHITE)
+    display.fill_rect_direct(0, bar_height, SCREEN_WIDTH, bar_height, GREEN)
+    display.text_direct("GREEN", 45, bar_height + 8, WHITE, GREEN)
     
     # 青
-    display.fill_rect(0, bar_height * 2, SCREEN_WIDTH, bar_height, BLUE)
-    display.text("BLUE", 48, bar_height * 2 + 8, WHITE)
+    display.fill_rect_direct(0, bar_height * 2, SCREEN_WIDTH, bar_height, BLUE)
+    display.text_direct("BLUE", 48, bar_height * 2 + 8, WHITE, BLUE)
     
     # 黄色
-    display.fill_rect(0, bar_height * 3, SCREEN_WIDTH, bar_height, BIRD_YELLOW)
-    display.text("YELLOW", 43, bar_height * 3 + 8, BLACK)
+    display.fill_rect_direct(0, bar_height * 3, SCREEN_WIDTH, bar_height, BIRD_YELLOW)
+    display.text_direct("YELLOW", 43, bar_height * 3 + 8, BLACK, BIRD_YELLOW)
     
     # 白
-    display.fill_rect(0, bar_height * 4, SCREEN_WIDTH, bar_height, WHITE)
-    display.text("WHITE", 45, bar_height * 4 + 8, BLACK)
+    display.fill_rect_direct(0, bar_height * 4, SCREEN_WIDTH, bar_height, WHITE)
+    display.text_direct("WHITE", 45, bar_height * 4 + 8, BLACK, WHITE)
     
     # 説明テキスト
-    display.text("Color Test", 30, bar_height * 5 + 5, WHITE)
-    display.text("If RED looks", 25, bar_height * 5 + 20, WHITE)
-    display.text("BLUE, change", 25, bar_height * 5 + 30, WHITE)
-    display.text("bgr flag", 35, bar_height * 5 + 40, WHITE)
-    display.text("Press A", 40, bar_height * 5 + 55, WHITE)
-    
-    display.show()
+    display.fill_rect_direct(0, bar_height * 5, SCREEN_WIDTH, display.height - bar_height * 5, BLACK)
+    display.text_direct("Color Test", 30, bar_height * 5 + 5, WHITE)
+    display.text_direct("If RED looks", 25, bar_height * 5 + 20, WHITE)
+    display.text_direct("BLUE, change", 25, bar_height * 5 + 30, WHITE)
+    display.text_direct("bgr flag", 35, bar_height * 5 + 40, WHITE)
+    display.text_direct("Press A", 40, bar_height * 5 + 55, WHITE)
     
     # ボタンの前回の状態を記憶
     button_state = {"prev": 1}
@@ -0,0 +1,101 @@
+"""
+Batched button input
+Reads every button with a single 32-bit load of the RP2040 SIO GPIO_IN
+register (machine.mem32) and computes press/release edges for all of
+them at once in viper. Ports without mem32 fall back to Pin.value().
+
+    buttons = inputscan.Scanner({"A": 28, "START": 11})
+    A = buttons.bit("A")
+    buttons.update()
+    if buttons.pressed & A:
+        ...
+
+Buttons are active low (pull-up, pressed = 0). After update():
+    held      buttons down now
+    pressed   buttons that went down since the previous update()
+    released  buttons that went up since the previous update()
+"""
+
+import array
+import micropython
+from micropython import const
+from machine import Pin
+
+try:
+    from machine import mem32
+except ImportError:
+    mem32 = None
+
+# SIO GPIO_IN レジスタ（GPIO0〜29 の入力レベル）
+SIO_GPIO_IN = 0xD0000004
+
+# 状態配列のインデックス（viper で添字に使うので const）
+MASK = const(0)
+HELD = const(1)
+PRESSED = const(2)
+RELEASED = const(3)
+
+# Viperネイティブコードで全ボタンのエッジを一度に計算
+@micropython.viper
+def _edges(raw: int, state) -> int:
+    """raw（押下で0）から state を更新し、押されているボタンのビットを返す"""
+    s = ptr32(state)
+    mask = int(s[MASK])
+    held = (raw ^ mask) & mask
+    changed = int(s[HELD]) ^ held
+    s[PRESSED] = held & changed
+    s[RELEASED] = int(s[HELD]) & changed
+    s[HELD] = held
+    return held
+
+class Scanner:
+    def __init__(self, pins, use_mem32=True):
+        """
+        Args:
+            pins: dict of button name -> GPIO number (0-29)
+            use_mem32: read GPIO_IN directly when machine.mem32 is available
+        """
+        self.pins = {}
+        self.bits = {}
+        mask = 0
+        for name, gpio in pins.items():
+            # mem32 で読む場合もプルアップ入力の設定は必要
+            self.pins[name] = Pin(gpio, Pin.IN, Pin.PULL_UP)
+            self.bits[name] = 1 << gpio
+            mask |= 1 << gpio
+        self.mask = mask
+        self._state = array.array("i", [mask, 0, 0, 0])
+        # True: GPIO_IN レジスタを直接読む / False: Pin.value() で読む
+        self.direct = use_mem32 and mem32 is not None
+        self._fallback = None
+        if not self.direct:
+            self._fallback = [(pin, self.bits[name]) for name, pin in self.pins.items()]
+        self.held = 0
+        self.pressed = 0
+        self.released = 0
+
+    def read(self):
+        """全ボタンの入力レベル（GPIO番号のビット、押下で0）"""
+        if self._fallback is None:
+            return mem32[SIO_GPIO_IN] & self.mask
+        raw = 0
+        for pin, bit in self._fallback:
+            if pin.value():
+                raw |= bit
+        return raw
+
+    def update(self):
+        """入力を読んでエッジを計算し、押されているボタンのビットを返す"""
+        held = _edges(self.read(), self._state)
+        state = self._state
+        self.held = held
+        self.pressed = state[PRESSED]
+        self.released = state[RELEASED]
+        return held
+
+    def bit(self, name):
+        return self.bits[name]
+
+    def names(self, bits):
+        """ビットに対応するボタン名のリスト"""
+        return [name for name, bit in self.bits.items() if bits & bit]
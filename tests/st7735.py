@@ -7,6 +7,18 @@ import time
 import framebuf
 import micropython
 
+# ヒープ計測（memtel.py がなければ計測しない）
+try:
+    import memtel
+except ImportError:
+    memtel = None
+
+# 最速カーネルの自動選択（kernels.py がなければ下の swap_bytes を使う）
+try:
+    import kernels
+except ImportError:
+    kernels = None
+
 # Viperネイティブコードで超高速バイトスワップ
 @micropython.viper
 def swap_bytes(dest, src, length: int):
@@ -67,6 +79,15 @@ MAGENTA = 0xF81F
 YELLOW = 0xFFE0
 WHITE = 0xFFFF
 
+# 直接描画で使う色ランバッファのピクセル数
+DIRECT_RUN = 128
+
+# 計測フェーズ（割り当て量の上限 bytes）
+if memtel:
+    _PH_ALLOC = memtel.phase("st7735.alloc")
+    _PH_INIT = memtel.phase("st7735.init", 1024)
+    _PH_SHOW = memtel.phase("st7735.show", 256)
+
 class ST7735:
     def __init__(self, spi, cs, dc, rst, width=128, height=160, bgr=True, xoffset=0, yoffset=0, rotation=0):
         self.spi = spi
@@ -86,10 +107,29 @@ class ST7735:
         self.cs.init(self.cs.OUT, value=1)
         self.dc.init(self.dc.OUT, value=0)
         self.rst.init(self.rst.OUT, value=1)
+        if memtel:
+            memtel.begin(_PH_ALLOC)
         self.buffer = bytearray(self.width * self.height * 2)
         self.fbuf = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.RGB565)
         # バイトスワップ用の一時バッファ（常に必要、高速化のため事前確保）
         self.swapped = bytearray(self.width * self.height * 2)
+        # 直接描画用の小さなバッファ（フレームバッファを経由しない描画で使用）
+        self._run = bytearray(DIRECT_RUN * 2)
+        self._run_color = -1
+        self._glyph = bytearray(8 * 8 * 2)
+        self._glyph_fbuf = framebuf.FrameBuffer(self._glyph, 8, 8, framebuf.RGB565)
+        self._glyph_swapped = bytearray(8 * 8 * 2)
+        # ホットループのカーネル（初回起動時に計測して選択、結果はファイルにキャッシュ）
+        if kernels:
+            self._swap = kernels.get("swap")
+            self._fill = kernels.get("fill")
+        else:
+            self._swap = swap_bytes
+            self._fill = None
+        # show() ごとにフレームを送る capture.Capture（None なら送らない）
+        self.capture = None
+        if memtel:
+            memtel.end(_PH_ALLOC)
     
     def write_cmd(self, cmd):
         self.dc.value(0)
@@ -112,6 +152,8 @@ class ST7735:
         time.sleep_ms(50)
     
     def init(self):
+        if memtel:
+            memtel.begin(_PH_INIT)
         self.reset()
         
         # Software reset
@@ -191,26 +233,26 @@ class ST7735:
         
         self.fill(BLACK)
         self.show()
+        if memtel:
+            memtel.end(_PH_INIT)
     
     def set_window(self, x0, y0, x1, y1):
         # Apply display offset to align with physical display
         # Adjust coordinates based on rotation
+        # For 90/270 degrees pass width=160, height=128 to the constructor;
+        # MADCTL exchanges rows and columns, so the offsets swap as well
         if self.rotation == 0:
             x0, x1 = x0 + self.xoffset, x1 + self.xoffset
             y0, y1 = y0 + self.yoffset, y1 + self.yoffset
         elif self.rotation == 90:
             x0, x1 = x0 + self.yoffset, x1 + self.yoffset
             y0, y1 = y0 + self.xoffset, y1 + self.xoffset
-            # Swap width and height for 90-degree rotation
-            self.width, self.height = self.height, self.width
         elif self.rotation == 180:
             x0, x1 = x0 + self.xoffset, x1 + self.xoffset
             y0, y1 = y0 + self.yoffset, y1 + self.yoffset
         elif self.rotation == 270:
             x0, x1 = x0 + self.yoffset, x1 + self.yoffset
             y0, y1 = y0 + self.xoffset, y1 + self.xoffset
-            # Swap width and height for 270-degree rotation
-            self.width, self.height = self.height, self.width
         
         self.write_cmd(ST7735_CASET)
         self.write_data(bytearray([0x00, x0, 0x00, x1]))
@@ -221,12 +263,18 @@ class ST7735:
         self.write_cmd(ST7735_RAMWR)
     
     def show(self):
+        if memtel:
+            memtel.begin(_PH_SHOW)
         self.set_window(0, 0, self.width - 1, self.height - 1)
         # FrameBufferはRGB565リトルエンディアン形式
         # ST7735はビッグエンディアンを期待するので常にバイトスワップが必要
         # Viperネイティブコードで超高速バイトスワップ
-        swap_bytes(self.swapped, self.buffer, len(self.buffer))
+        self._swap(self.swapped, self.buffer, len(self.buffer))
         self.write_data(self.swapped)
+        if memtel:
+            memtel.end(_PH_SHOW)
+        if self.capture:
+            self.capture.frame(self.swapped)
     
     def fill(self, color):
         self.fbuf.fill(color)
@@ -251,3 +299,73 @@ class ST7735:
     
     def text(self, string, x, y, color):
         self.fbuf.text(string, x, y, color)
+    
+    # --- 直接描画（フレームバッファを経由せずパネルに書き込む） ---
+    # self.buffer は変更しないので、次の show() で上書きされる
+    
+    def _write_run(self, color, count):
+        """同じ色を count ピクセル分パネルに転送"""
+        run = self._run
+        if color != self._run_color:
+            if self._fill:
+                self._fill(run, len(run), color)
+            else:
+                hi = (color >> 8) & 0xFF
+                lo = color & 0xFF
+                for i in range(0, len(run), 2):
+                    run[i] = hi
+                    run[i + 1] = lo
+            self._run_color = color
+        n = len(run) // 2
+        self.dc.value(1)
+        self.cs.value(0)
+        while count >= n:
+            self.spi.write(run)
+            count -= n
+        if count:
+            self.spi.write(memoryview(run)[:count * 2])
+        self.cs.value(1)
+    
+    def fill_rect_direct(self, x, y, w, h, color):
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        self.set_window(x, y, x + w - 1, y + h - 1)
+        self._write_run(color, w * h)
+    
+    def fill_direct(self, color):
+        self.fill_rect_direct(0, 0, self.width, self.height, color)
+    
+    def hline_direct(self, x, y, w, color):
+        self.fill_rect_direct(x, y, w, 1, color)
+    
+    def vline_direct(self, x, y, h, color):
+        self.fill_rect_direct(x, y, 1, h, color)
+    
+    def rect_direct(self, x, y, w, h, color):
+        self.fill_rect_direct(x, y, w, 1, color)
+        self.fill_rect_direct(x, y + h - 1, w, 1, color)
+        self.fill_rect_direct(x, y, 1, h, color)
+        self.fill_rect_direct(x + w - 1, y, 1, h, color)
+    
+    def text_direct(self, string, x, y, color, bg=BLACK):
+        """背景色付きで文字を直接描画（画面からはみ出す文字は描画しない）"""
+        if y < 0 or y + 8 > self.height:
+            return
+        for ch in string:
+            if 0 <= x and x + 8 <= self.width:
+                self._glyph_fbuf.fill(bg)
+                self._glyph_fbuf.text(ch, 0, 0, color)
+                self._swap(self._glyph_swapped, self._glyph, len(self._glyph))
+                self.set_window(x, y, x + 7, y + 7)
+                self.write_data(self._glyph_swapped)
+            x += 8
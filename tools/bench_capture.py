@@ -0,0 +1,97 @@
+"""
+Measure frame capture on the flappy bird scene
+
+    python tools/bench_capture.py [frames]
+
+Plays one autopilot game with capture.attach() writing to memory,
+decodes the stream with capture_decode.Decoder and checks every frame
+against what show() sent to the panel, also when decoding starts in the
+middle of the stream. Prints the compression ratio, bytes per frame and
+the serial bandwidth needed at 30 fps, next to RLE of every row without
+merging identical rows. Encoder times are host times; run
+capture.Capture.report() on the board for device numbers.
+"""
+
+import io
+import random
+import struct
+import sys
+
+import hostenv
+
+hostenv.setup()
+
+import capture  # noqa: E402
+import flappy_bird  # noqa: E402
+import img2rgb565  # noqa: E402
+import soak  # noqa: E402
+from capture_decode import Decoder  # noqa: E402
+
+FPS = 30
+
+
+def play(frames):
+    """1ゲーム分のフレームをキャプチャし、(Capture, ストリーム, 送ったフレーム) を返す"""
+    display = hostenv.make_display()
+    out = io.BytesIO()
+    cap = capture.attach(display, out)
+    sent = []
+    encode = cap.frame
+
+    def record(frame):
+        sent.append(bytes(frame))
+        encode(frame)
+
+    cap.frame = record
+    flappy_bird.display = display
+    flappy_bird.sound_enabled = False
+    random.seed(1)
+    try:
+        flappy_bird.main_game(soak.Autopilot(frames), 0)
+    finally:
+        flappy_bird.sound_enabled = True
+    return cap, out.getvalue(), sent
+
+
+def verify(stream, sent):
+    """復元したフレームが送ったフレームと一致するか"""
+    decoded = [list(pixels) for _, _, _, pixels in Decoder().frames(stream)]
+    assert len(decoded) == len(sent), (len(decoded), len(sent))
+    for i, (pixels, frame) in enumerate(zip(decoded, sent)):
+        expected = list(struct.unpack(">{}H".format(len(frame) // 2), frame))
+        assert pixels == expected, "frame {} differs".format(i)
+    # 途中から記録しても次のフレームから復元できる
+    half = len(stream) // 2
+    decoder = Decoder()
+    tail = [list(pixels) for _, _, _, pixels in decoder.frames(stream[half:])]
+    assert tail and tail == decoded[len(decoded) - len(tail):], len(tail)
+    return len(tail)
+
+
+def plain_size(sent, width, height):
+    """同じ行をまとめず、全行を RLE で送った場合の1フレームあたりのバイト数"""
+    total = 0
+    row = ">{}H".format(width)
+    for frame in sent:
+        total += capture.HEADER_SIZE
+        for y in range(height):
+            pixels = struct.unpack_from(row, frame, y * width * 2)
+            total += len(img2rgb565.encode_rle(list(pixels)))
+    return total / len(sent)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cap, stream, sent = play(frames)
+    tail = verify(stream, sent)
+    per_frame = cap.bytes_sent / cap.frames
+    print("[OK] {} frames identical, last {} also when decoding from mid-stream".format(cap.frames, tail))
+    plain = plain_size(sent, cap.width, cap.height)
+    assert per_frame < plain, (per_frame, plain)
+    print("[OK] ratio {:.3f}, {:.0f} B/frame ({:.0f} B/frame without merging rows), {:.1f} KB/s at {} fps, "
+          "encode avg {} us max {} us (host)".format(
+              cap.ratio(), per_frame, plain, per_frame * FPS / 1024, FPS, cap.total_us // cap.frames, cap.max_us))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Host benchmark: painter's order vs. the retained-mode scene list
+
+Plays autopiloted flappy bird frames and draws every frame twice: once
+directly into a framebuffer in painter's order and once through
+scene.Scene. The two framebuffers must be byte-identical. Reports the
+pixels written per frame by each path. Then plays games with
+flappy_bird.RETAINED_RENDER under memtel (tracemalloc) and checks that
+render() does not allocate and the frame stays within its budget.
+
+    python tools/bench_scene.py [frames]
+"""
+
+import random
+import sys
+import time
+
+import hostenv
+
+hostenv.setup()
+
+import memtel  # noqa: E402
+import flappy_bird  # noqa: E402
+import scene  # noqa: E402
+import soak  # noqa: E402
+
+
+# CPython では 256 を超える int（統計の画素数）がオブジェクトになる分だけ許す。
+# デバイスでは小さい整数なので割り当ては 0
+PH_RENDER = memtel.phase("scene.render", budget=64)
+
+
+def check_alloc():
+    """RETAINED_RENDER でプレイし、render() とフレームの割り当てを memtel で確認"""
+    memtel.enable()
+    memtel.reset()
+    render = scene.Scene.render
+
+    def measured(self):
+        memtel.begin(PH_RENDER)
+        written = render(self)
+        memtel.end(PH_RENDER)
+        return written
+
+    scene.Scene.render = measured
+    flappy_bird.RETAINED_RENDER = True
+    try:
+        random.seed(1)
+        for _ in range(3):
+            flappy_bird.main_game(soak.Autopilot(200), 0)
+    finally:
+        flappy_bird.RETAINED_RENDER = False
+        scene.Scene.render = render
+        memtel.disable()
+    stats = memtel.get("scene.render")
+    frame = memtel.get("flappy.frame")
+    memtel.check()
+    print("[OK] RETAINED_RENDER: {} renders, max {} B per render, frame max {} B (budget {})".format(
+        stats["count"], stats["max"], frame["max"], frame["budget"]))
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    painter = hostenv.make_display()
+    retained = hostenv.make_display()
+    frame_scene = scene.Scene(retained)
+    random.seed(3)
+
+    stats = {"frames": 0, "painted": 0, "written": 0, "painter_s": 0.0, "scene_s": 0.0}
+    pilot = soak.Autopilot(frames)
+
+    def step(bird, pipes):
+        # main_game の入力処理の時点で、前フレームと同じ状態を両方の経路で描画
+        score = sum(1 for p in pipes if p.scored)
+        t0 = time.perf_counter()
+        flappy_bird.draw_frame(painter, bird, pipes, score)
+        t1 = time.perf_counter()
+        frame_scene.clear()
+        flappy_bird.draw_frame(frame_scene, bird, pipes, score)
+        frame_scene.render()
+        t2 = time.perf_counter()
+        assert painter.buffer == retained.buffer, "frame {} differs".format(stats["frames"])
+        stats["frames"] += 1
+        stats["painted"] += frame_scene.pixels_painted
+        stats["written"] += frame_scene.pixels_written
+        stats["painter_s"] += t1 - t0
+        stats["scene_s"] += t2 - t1
+        return pilot(bird, pipes)
+
+    flappy_bird.display = painter
+    flappy_bird.sound_enabled = False
+    while stats["frames"] < frames:
+        flappy_bird.main_game(step, 0)
+
+    n = stats["frames"]
+    painted = stats["painted"] / n
+    written = stats["written"] / n
+    print("[OK] {} frames pixel-identical to painter's order".format(n))
+    print("pixels per frame: painter {:.0f}, scene {:.0f} ({:.1f}% fewer writes, screen = {})".format(
+        painted, written, 100 * (1 - written / painted), 128 * 160))
+    print("host time per frame: painter {:.2f} ms, scene {:.2f} ms".format(
+        stats["painter_s"] * 1000 / n, stats["scene_s"] * 1000 / n))
+    check_alloc()
+
+
+if __name__ == "__main__":
+    main()
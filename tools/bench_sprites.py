@@ -0,0 +1,158 @@
+"""
+Host check and benchmark for the sprite variant cache
+
+Checks the viper transform kernel against pure-Python references
+(flips, quarter turns and integer scales must be exact; other angles are
+compared with a floating-point nearest-neighbour rotation), checks the
+LRU eviction order and the statistics, and times variant generation and
+cache hits. Timings are CPython running the kernel as plain Python.
+
+    python tools/bench_sprites.py
+"""
+
+import math
+import random
+import time
+
+import hostenv
+
+hostenv.setup()
+
+import sprites  # noqa: E402
+
+
+def make_sprite(rng, width, height):
+    buf = bytearray(width * height * 2)
+    for i in range(width * height):
+        c = rng.randrange(0x10000)
+        if c == sprites.KEY:
+            c = 0
+        buf[i * 2] = c & 0xFF
+        buf[i * 2 + 1] = c >> 8
+    return sprites.Sprite(buf, width, height)
+
+
+def pixels(buf):
+    return [buf[i] | (buf[i + 1] << 8) for i in range(0, len(buf), 2)]
+
+
+def exact(sprite, quarter, flip_x, flip_y, scale):
+    """反転 → 時計回りに quarter * 90 度 → 拡大 の参照実装"""
+    w, h = sprite.width, sprite.height
+    src = pixels(sprite.buf)
+
+    def at(x, y):
+        if flip_x:
+            x = w - 1 - x
+        if flip_y:
+            y = h - 1 - y
+        return src[y * w + x]
+
+    dw, dh = (h, w) if quarter % 2 else (w, h)
+    out = []
+    for y in range(dh * scale):
+        for x in range(dw * scale):
+            u, v = x // scale, y // scale
+            if quarter == 0:
+                out.append(at(u, v))
+            elif quarter == 1:
+                out.append(at(v, h - 1 - u))
+            elif quarter == 2:
+                out.append(at(w - 1 - u, h - 1 - v))
+            else:
+                out.append(at(w - 1 - v, u))
+    return out
+
+
+def rotated(sprite, angle, width, height):
+    """浮動小数点で逆算する最近傍の回転"""
+    w, h = sprite.width, sprite.height
+    src = pixels(sprite.buf)
+    c, s = math.cos(angle), math.sin(angle)
+    out = []
+    for y in range(height):
+        for x in range(width):
+            rx, ry = x + 0.5 - width / 2, y + 0.5 - height / 2
+            u = math.floor(rx * c + ry * s + w / 2)
+            v = math.floor(ry * c - rx * s + h / 2)
+            out.append(src[v * w + u] if 0 <= u < w and 0 <= v < h else sprites.KEY)
+    return out
+
+
+def check_exact(rng):
+    sprite = make_sprite(rng, 7, 5)
+    cache = sprites.SpriteCache(budget=1 << 20)
+    count = 0
+    for quarter in range(4):
+        for flip_x in (False, True):
+            for flip_y in (False, True):
+                for scale in (1, 2, 3):
+                    v = cache.get(sprite, quarter * sprites.STEPS // 4, flip_x, flip_y, scale)
+                    assert pixels(v.buf) == exact(sprite, quarter, flip_x, flip_y, scale), \
+                        (quarter, flip_x, flip_y, scale)
+                    count += 1
+    print("[OK] {} flip / quarter-turn / scale variants exact".format(count))
+
+
+def check_angles(rng):
+    sprite = make_sprite(rng, 8, 8)
+    cache = sprites.SpriteCache(budget=1 << 20)
+    worst = 0
+    for step in range(sprites.STEPS):
+        v = cache.get(sprite, step)
+        got = pixels(v.buf)
+        ref = rotated(sprite, 2 * math.pi * step / sprites.STEPS, v.width, v.height)
+        diff = sum(1 for a, b in zip(got, ref) if a != b) / len(ref)
+        worst = max(worst, diff)
+    assert worst < 0.05, worst
+    print("[OK] {} rotation steps match float rotation ({:.1%} pixels differ at most)".format(
+        sprites.STEPS, worst))
+
+
+def check_lru(rng):
+    a = make_sprite(rng, 8, 8)
+    b = make_sprite(rng, 8, 8)
+    # 128 バイトのバリエーションが3つ入る
+    cache = sprites.SpriteCache(budget=3 * 128)
+    va = cache.get(a)
+    cache.get(b)
+    cache.get(a, flip_x=True)
+    assert cache.get(a) is va          # a を最近使ったものにする
+    cache.get(b, flip_y=True)          # 最も古い b が追い出される
+    assert cache.evictions == 1 and cache.used == 3 * 128
+    assert cache.get(a) is va
+    cache.get(b)                       # 追い出されたので作り直し
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 5, 2), (cache.hits, cache.misses, cache.evictions)
+    try:
+        cache.get(a, scale=3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("oversized variant accepted")
+    print("[OK] LRU eviction within {} bytes, hit rate {:.2f}".format(cache.budget, cache.hit_rate()))
+
+
+def bench(rng):
+    sprite = make_sprite(rng, 8, 8)
+    cache = sprites.SpriteCache(budget=2048)
+    for tilt in range(-1, 4):
+        cache.get(sprite, tilt)
+    rounds = 20000
+    start = time.perf_counter()
+    for i in range(rounds):
+        cache.get(sprite, i % 5 - 1)
+    hit_us = (time.perf_counter() - start) * 1e6 / rounds
+    cache.report()
+    print("host: generate {} us per 8x8 variant, hit {:.2f} us".format(cache.gen_us // cache.misses, hit_us))
+
+
+def main():
+    rng = random.Random(1)
+    check_exact(rng)
+    check_angles(rng)
+    check_lru(rng)
+    bench(rng)
+
+
+if __name__ == "__main__":
+    main()
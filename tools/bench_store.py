@@ -0,0 +1,85 @@
+"""
+Host benchmark: record store vs. rewriting a JSON file
+
+Measures the write latency of saving a high score at game over and the
+boot-time cost of loading the settings, for store.RecordStore and for
+a plain JSON file rewritten on every save. Absolute numbers are for the
+host filesystem; the ratio is what carries over to flash.
+
+    python tools/bench_store.py [writes]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import hostenv
+
+hostenv.setup()
+
+import store  # noqa: E402
+
+SETTINGS = {"bgr": 0, "xoff": 2, "yoff": 1, "rot": 180}
+
+
+def bench_json(path, writes):
+    data = dict(SETTINGS)
+    start = time.perf_counter()
+    for i in range(writes):
+        data["hi_fb"] = i
+        with open(path, "w") as f:
+            json.dump(data, f)
+    write_us = (time.perf_counter() - start) * 1e6 / writes
+
+    start = time.perf_counter()
+    for _ in range(100):
+        with open(path) as f:
+            json.load(f)
+    load_us = (time.perf_counter() - start) * 1e6 / 100
+    return write_us, load_us, os.path.getsize(path)
+
+
+def bench_store(path, writes):
+    s = store.RecordStore(path)
+    for key, value in SETTINGS.items():
+        s.set(key, value)
+    s.flush()
+
+    set_total = 0.0
+    flush_total = 0.0
+    for i in range(writes):
+        t0 = time.perf_counter()
+        s.set("hi_fb", i)
+        t1 = time.perf_counter()
+        s.flush()
+        t2 = time.perf_counter()
+        set_total += t1 - t0
+        flush_total += t2 - t1
+
+    start = time.perf_counter()
+    for _ in range(100):
+        loaded = store.RecordStore(path)
+    load_us = (time.perf_counter() - start) * 1e6 / 100
+    assert loaded.get("hi_fb") == writes - 1
+    assert loaded.get("rot") == 180
+    return set_total * 1e6 / writes, flush_total * 1e6 / writes, load_us, os.path.getsize(path)
+
+
+def main():
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        j_write, j_load, j_size = bench_json(os.path.join(tmp, "settings.json"), writes)
+        s_set, s_flush, s_load, s_size = bench_store(os.path.join(tmp, "store.dat"), writes)
+
+    print("writes: {}".format(writes))
+    print("json   rewrite at game over : {:8.1f} us/save, boot load {:7.1f} us ({} bytes)".format(
+        j_write, j_load, j_size))
+    print("store  set() in game loop   : {:8.1f} us/save".format(s_set))
+    print("store  flush() on idle      : {:8.1f} us/save, boot load {:7.1f} us ({} bytes)".format(
+        s_flush, s_load, s_size))
+
+
+if __name__ == "__main__":
+    main()
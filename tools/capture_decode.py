@@ -0,0 +1,136 @@
+"""
+Rebuild frames from a capture stream (projects/flappy_bird/capture.py)
+
+    python tools/capture_decode.py capture.bin -o frames/          # PPM per frame
+    python tools/capture_decode.py capture.bin --video out.mp4     # needs ffmpeg
+
+Record the stream from the board with the serial port in raw mode:
+
+    stty -F /dev/ttyACM0 raw && cat /dev/ttyACM0 > capture.bin
+
+Text printed by the game between frames is skipped. Every frame is
+complete, so a recording may start mid-stream. Screens drawn straight
+to the panel (*_direct, assets.show_image) are not in the stream; the
+last show() frame stays on screen while they are up.
+"""
+
+import argparse
+import os
+import struct
+import subprocess
+import sys
+
+from img2rgb565 import decode_rle
+
+MAGIC = b"FCAP"
+HEADER = ">4sHHHH"
+HEADER_SIZE = struct.calcsize(HEADER)
+GROUP = ">H"
+GROUP_SIZE = struct.calcsize(GROUP)
+MAX_SIZE = 320
+
+
+class Decoder:
+    """ストリームを順に読み、フレームを復元する"""
+
+    def __init__(self):
+        self.last_seq = None
+        self.missing = 0   # seq の欠番
+
+    def _parse(self, data, pos):
+        """pos からフレームを1つ読み、(seq, width, height, pixels, 次の位置) を返す"""
+        magic, seq, width, height, groups = struct.unpack_from(HEADER, data, pos)
+        if not 0 < width <= MAX_SIZE or not 0 < height <= MAX_SIZE or not 0 < groups <= height:
+            raise ValueError("bad header")
+        pos += HEADER_SIZE
+        pixels = []
+        for _ in range(groups):
+            count, = struct.unpack_from(GROUP, data, pos)
+            pos += GROUP_SIZE
+            row, used = decode_rle(data[pos:pos + width * 3 + 8], width)
+            if len(row) != width:
+                raise ValueError("bad row")
+            pixels.extend(row * count)
+            pos += used
+        if len(pixels) != width * height:
+            raise ValueError("bad row count")
+        return seq, width, height, pixels, pos
+
+    def frames(self, data):
+        """data に含まれるフレームを (seq, width, height, pixels) として順に返す"""
+        pos = 0
+        while True:
+            pos = data.find(MAGIC, pos)
+            if pos < 0:
+                return
+            try:
+                seq, width, height, pixels, end = self._parse(data, pos)
+            except (ValueError, IndexError, struct.error):
+                pos += 1
+                continue
+            pos = end
+            if self.last_seq is not None:
+                self.missing += (seq - self.last_seq - 1) & 0xFFFF
+            self.last_seq = seq
+            yield seq, width, height, pixels
+
+
+def to_rgb24(pixels):
+    """RGB565 のピクセル列を RGB888 のバイト列に変換"""
+    out = bytearray(len(pixels) * 3)
+    i = 0
+    for c in pixels:
+        out[i] = ((c >> 11) & 0x1F) * 255 // 31
+        out[i + 1] = ((c >> 5) & 0x3F) * 255 // 63
+        out[i + 2] = (c & 0x1F) * 255 // 31
+        i += 3
+    return bytes(out)
+
+
+def save_ppm(path, width, height, pixels):
+    with open(path, "wb") as f:
+        f.write("P6 {} {} 255\n".format(width, height).encode())
+        f.write(to_rgb24(pixels))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode a frame capture stream")
+    parser.add_argument("src", help="capture file ('-' for stdin)")
+    parser.add_argument("-o", "--out-dir", help="write frame_NNNNN.ppm files here")
+    parser.add_argument("--video", help="encode to a video file with ffmpeg")
+    parser.add_argument("--fps", type=int, default=30, help="video frame rate (default: 30)")
+    args = parser.parse_args(argv)
+
+    if args.src == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(args.src, "rb") as f:
+            data = f.read()
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    decoder = Decoder()
+    ffmpeg = None
+    count = 0
+    for seq, width, height, pixels in decoder.frames(data):
+        if args.out_dir:
+            save_ppm(os.path.join(args.out_dir, "frame_{:05d}.ppm".format(count)), width, height, pixels)
+        if args.video:
+            if ffmpeg is None:
+                ffmpeg = subprocess.Popen(
+                    ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                     "-s", "{}x{}".format(width, height), "-r", str(args.fps), "-i", "-",
+                     "-pix_fmt", "yuv420p", "-vf", "scale=iw*4:ih*4:flags=neighbor", args.video],
+                    stdin=subprocess.PIPE)
+            ffmpeg.stdin.write(to_rgb24(pixels))
+        count += 1
+    if ffmpeg is not None:
+        ffmpeg.stdin.close()
+        ffmpeg.wait()
+
+    print("{} frames decoded ({} missing), {} bytes".format(count, decoder.missing, len(data)))
+
+
+if __name__ == "__main__":
+    main()
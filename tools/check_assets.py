@@ -0,0 +1,208 @@
+"""
+Host check for assets.show_image() with the panel emulator
+
+Encodes test images with img2rgb565 (raw and RLE), streams them through
+assets.show_image() into st7735_emu.PanelEmulator and compares the GRAM
+readback with the source pixels. The RLE images are generated until the
+packet layout covers the chunk-boundary cases of the streaming decoder:
+run headers and run colors split across a CHUNK_SIZE read, literal
+packets split between and in the middle of a pixel, and runs crossing the
+output buffer. Also checks that display.buffer is untouched and reports
+the peak allocation of show_image() beyond opening the file.
+
+    python tools/check_assets.py
+"""
+
+import os
+import random
+import struct
+import tempfile
+import tracemalloc
+
+import hostenv
+from st7735_emu import PanelEmulator
+
+hostenv.setup()
+
+import st7735  # noqa: E402
+import assets  # noqa: E402
+import img2rgb565  # noqa: E402
+
+CHUNK = assets.CHUNK_SIZE
+# 出力バッファ1回分のピクセル数
+OUT_PIXELS = CHUNK // 2
+
+CASES = (
+    "run header at chunk end",
+    "run color split across chunks",
+    "literal header at chunk end",
+    "literal split between pixels",
+    "literal split mid-pixel",
+    "run crossing the output buffer",
+)
+
+
+def make_pixels(rng, count):
+    """同色の連続とばらばらの色を混ぜたピクセル列"""
+    pixels = []
+    while len(pixels) < count:
+        if rng.random() < 0.5:
+            pixels.extend([rng.randrange(0x10000)] * rng.randint(2, 300))
+        else:
+            pixels.extend(rng.randrange(0x10000) for _ in range(rng.randint(1, 200)))
+    return pixels[:count]
+
+
+def coverage(data):
+    """RLEパケットの並びがどのチャンク境界のケースを含むか"""
+    found = set()
+    pos = 0
+    pixel = 0
+    while pos < len(data):
+        h = data[pos]
+        boundary = (pos // CHUNK + 1) * CHUNK
+        if h & 0x80:
+            count = (h & 0x7F) + 1
+            if boundary - pos == 1:
+                found.add("run header at chunk end")
+            elif boundary - pos == 2:
+                found.add("run color split across chunks")
+            if pixel // OUT_PIXELS != (pixel + count - 1) // OUT_PIXELS:
+                found.add("run crossing the output buffer")
+            size = 3
+        else:
+            count = h + 1
+            size = 1 + count * 2
+            if boundary - pos == 1:
+                found.add("literal header at chunk end")
+            elif boundary < pos + size:
+                # ペイロードの何バイト目でチャンクが切れるか
+                if (boundary - pos - 1) % 2:
+                    found.add("literal split mid-pixel")
+                else:
+                    found.add("literal split between pixels")
+        pos += size
+        pixel += count
+    return found
+
+
+def write_image(path, width, height, pixels, rle):
+    if rle:
+        payload = img2rgb565.encode_rle(pixels)
+    else:
+        payload = b"".join(struct.pack(">H", p) for p in pixels)
+    with open(path, "wb") as f:
+        f.write(struct.pack(img2rgb565.HEADER, img2rgb565.MAGIC, width, height,
+                            img2rgb565.FLAG_RLE if rle else 0))
+        f.write(payload)
+    return payload
+
+
+def le_bytes(pixels):
+    """FrameBuffer と同じ RGB565 リトルエンディアン"""
+    out = bytearray(len(pixels) * 2)
+    for i, p in enumerate(pixels):
+        out[i * 2] = p & 0xFF
+        out[i * 2 + 1] = p >> 8
+    return out
+
+
+def make_images(rng, tmp):
+    """(名前, パス, x, y, 幅, 高さ, ピクセル) のリスト"""
+    images = []
+    covered = set()
+    seed = 0
+    while covered != set(CASES):
+        seed += 1
+        if seed > 200:
+            raise AssertionError("test images miss cases: {}".format(set(CASES) - covered))
+        pixels = make_pixels(rng, 128 * 160)
+        path = os.path.join(tmp, "rle{}.img".format(seed))
+        new = coverage(write_image(path, 128, 160, pixels, True)) - covered
+        if new:
+            covered |= new
+            images.append(("rle{}".format(seed), path, 0, 0, 128, 160, pixels))
+    pixels = make_pixels(rng, 128 * 160)
+    path = os.path.join(tmp, "raw.img")
+    write_image(path, 128, 160, pixels, False)
+    images.append(("raw", path, 0, 0, 128, 160, pixels))
+    # 位置をずらした小さい画像（ウィンドウの指定）
+    pixels = make_pixels(rng, 37 * 23)
+    path = os.path.join(tmp, "small.img")
+    write_image(path, 37, 23, pixels, True)
+    images.append(("small", path, 50, 71, 37, 23, pixels))
+    return images
+
+
+def check_pixels(images):
+    emu = PanelEmulator()
+    display = st7735.ST7735(emu.spi, cs=emu.cs, dc=emu.dc, rst=emu.rst, width=128, height=160,
+                            bgr=False, xoffset=2, yoffset=1, rotation=180)
+    display.init()
+    display.fill(0x1234)
+    before = bytes(display.buffer)
+    for name, path, x, y, width, height, pixels in images:
+        with emu.measure() as m:
+            assert assets.show_image(display, path, x, y) == (width, height)
+        assert m.pixels == width * height, (name, m.pixels)
+        assert emu.readback(x, y, width, height, 2, 1) == le_bytes(pixels), name
+        assert emu.stray_pixels() == 0 and not emu.errors, (name, emu.errors)
+        assert bytes(display.buffer) == before, name
+        print("[OK] {:<6s} {}x{} at ({}, {}): {} bytes on the bus, GRAM matches".format(
+            name, width, height, x, y, m.bytes))
+    print("[OK] display.buffer untouched")
+
+
+def open_peak(path):
+    """ファイルを開いてチャンクごとに読むだけの割り当て（CPython のファイルオブジェクト分）"""
+    chunk = bytearray(CHUNK)
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    with open(path, "rb") as f:
+        while f.readinto(chunk):
+            pass
+    return tracemalloc.get_traced_memory()[1] - base
+
+
+def show_peak(display, path, x, y):
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    assets.show_image(display, path, x, y)
+    return tracemalloc.get_traced_memory()[1] - base
+
+
+def check_alloc(images):
+    # 割り当てだけを見るのでエミュレータではなく書き込みを数えるだけの SPI を使う
+    display = hostenv.make_display()
+    tracemalloc.start()
+    try:
+        name, path, x, y = images[0][:4]
+        assets._chunk = assets._out = None
+        first = show_peak(display, path, x, y) - open_peak(path)
+        peaks = {image[0]: show_peak(display, image[1], image[2], image[3]) - open_peak(image[1])
+                 for image in images}
+    finally:
+        tracemalloc.stop()
+    steady = max(peaks.values())
+    # 初回は2つのチャンクバッファを確保し、以降は再利用する。2回目以降に残るのは
+    # ヘッダのタプルや、ホストの ptr8/ptr32 スタンドインが作る memoryview の分で、
+    # 画像の大きさには依存しない
+    assert first >= 2 * CHUNK, first
+    assert steady < 2 * CHUNK, steady
+    assert peaks["small"] == peaks[images[0][0]], peaks
+    print("[OK] peak allocation beyond opening the file: first call {} B "
+          "(2 x {} B buffers), then {} B for any image size".format(first, CHUNK, steady))
+
+
+def main():
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        images = make_images(rng, tmp)
+        print("[OK] {} RLE images cover: {}".format(
+            sum(1 for image in images if image[0].startswith("rle")), ", ".join(CASES)))
+        check_pixels(images)
+        check_alloc(images)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Host check for the ST7735 immediate-mode (direct) drawing calls
+
+Records every SPI write together with the DC line and verifies that
+  - fill_rect_direct() sends exactly w * h * 2 pixel bytes,
+  - the bytes are the requested color in big-endian order,
+  - direct calls never touch display.buffer or send a full frame.
+
+    python tools/check_direct.py
+"""
+
+import hostenv
+
+hostenv.setup()
+
+import st7735  # noqa: E402
+
+
+class Recorder:
+    """SPIへの書き込みを DC の状態と一緒に記録する"""
+
+    def __init__(self, spi, dc):
+        self.dc = dc
+        self.writes = []
+        spi.on_write = self.on_write
+
+    def on_write(self, buf):
+        self.writes.append((self.dc.value(), bytes(buf)))
+
+    def clear(self):
+        self.writes = []
+
+    def pixel_bytes(self):
+        """最後の RAMWR 以降のデータバイト"""
+        data = b""
+        for is_data, buf in self.writes:
+            if not is_data:
+                data = b"" if buf[0] == st7735.ST7735_RAMWR else data
+                continue
+            data += buf
+        return data
+
+    def largest_write(self):
+        return max((len(buf) for _, buf in self.writes), default=0)
+
+
+def main():
+    display = hostenv.make_display()
+    rec = Recorder(display.spi, display.dc)
+    display.fill(0x1234)
+    before = bytes(display.buffer)
+
+    for x, y, w, h, color in [(0, 0, 128, 160, 0x5D9F), (3, 7, 50, 33, 0xF800),
+                              (10, 10, 1, 1, 0x07E0), (100, 150, 40, 40, 0x001F)]:
+        rec.clear()
+        display.fill_rect_direct(x, y, w, h, color)
+        cw = min(w, 128 - x)
+        ch = min(h, 160 - y)
+        data = rec.pixel_bytes()
+        assert len(data) == cw * ch * 2, (len(data), cw * ch * 2)
+        assert data == bytes([color >> 8, color & 0xFF]) * (cw * ch)
+        assert rec.largest_write() <= st7735.DIRECT_RUN * 2
+        print("[OK] fill_rect_direct({}, {}, {}, {}) sent {} bytes".format(x, y, w, h, len(data)))
+
+    rec.clear()
+    display.hline_direct(0, 20, 128, 0xFFFF)
+    display.rect_direct(20, 60, 88, 40, 0xF800)
+    display.text_direct("GAME OVER", 25, 70, 0xF800, 0x0000)
+    assert rec.largest_write() < 128 * 160 * 2
+    print("[OK] hline/rect/text direct: largest write {} bytes".format(rec.largest_write()))
+
+    assert bytes(display.buffer) == before
+    print("[OK] display.buffer untouched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Parity check of tools/flappy_sim.py against the scalar game (needs NumPy)
+
+Plays flappy_bird.main_game() on stand-ins (real driver, stand-in SPI)
+for several seeds with the soak autopilot, the autopilot with random
+mistakes and a random button sequence, recording the bird and pipes
+every frame. The vectorized simulator runs the same games from the same
+gaps and inputs and must match frame by frame, including the final
+score and length. Then measures simulator throughput.
+
+    python tools/check_flappy_sim.py
+"""
+
+import random
+
+import numpy as np
+
+import hostenv
+
+hostenv.setup()
+
+import flappy_bird  # noqa: E402
+import soak  # noqa: E402
+import flappy_sim  # noqa: E402
+
+AUTOPILOT_SEEDS = [1, 2, 3, 4]
+AUTOPILOT_FRAMES = 400
+NOISY_SEEDS = list(range(10, 18))
+RANDOM_SEEDS = list(range(100, 124))
+MAX_FRAMES = 2000
+GAP_COUNT = MAX_FRAMES * flappy_bird.PIPE_SPEED // flappy_sim.PIPE_SPACING + flappy_sim.PIPE_COUNT + 1
+
+
+class Recorder:
+    """main_game() の入力コールバック。毎フレーム鳥とパイプの状態を記録する"""
+
+    def __init__(self, decide):
+        self.decide = decide
+        self.states = []
+
+    def __call__(self, bird, pipes):
+        self.states.append((bird.y, bird.velocity, pipes[0].x) + tuple(p.gap_y for p in pipes))
+        return self.decide(bird, pipes)
+
+
+def play_scalar(seed, decide):
+    """スカラー版を1ゲーム実行し、(記録, スコア) を返す"""
+    recorder = Recorder(decide)
+    random.seed(seed)
+    score = flappy_bird.main_game(recorder, 0)
+    return recorder.states, score
+
+
+def play_vector(seeds, actions=None, autopilot_frames=0, noise=None):
+    """同じ隙間で全ゲームを並列に実行し、ゲームごとの (記録, スコア) を返す"""
+    sim = flappy_sim.FlappySim(len(seeds), gaps=flappy_sim.random_gaps(seeds, GAP_COUNT))
+    obs = sim.reset()
+    states = [[] for _ in seeds]
+    step = 0
+    while not sim.done.all():
+        for g in np.flatnonzero(~sim.done):
+            states[g].append((int(sim.y[g]), int(sim.velocity[g]), int(sim.pipe_x[g]))
+                             + tuple(int(v) for v in sim.gap_y[g]))
+        if actions is None:
+            jump = flappy_sim.autopilot(obs) & (step < autopilot_frames)
+            if noise is not None:
+                jump ^= noise[:, step]
+        else:
+            jump = actions[:, step]
+        obs, scores, done = sim.step(jump)
+        step += 1
+    return states, sim.score
+
+
+def compare(label, seeds, scalar, vector):
+    states, scores = vector
+    frames = 0
+    for g, seed in enumerate(seeds):
+        expected, score = scalar[g]
+        for t, (a, b) in enumerate(zip(expected, states[g])):
+            assert a == b, "{} seed={} frame={}: scalar {} != sim {}".format(label, seed, t, a, b)
+        assert len(expected) == len(states[g]), (label, seed, len(expected), len(states[g]))
+        assert score == scores[g], (label, seed, score, scores[g])
+        frames += len(expected)
+    print("[OK] {:<9s}: {} games, {} frames identical, scores {}".format(
+        label, len(seeds), frames, [scalar[g][1] for g in range(len(seeds))]))
+
+
+def main():
+    flappy_bird.display = hostenv.make_display()
+    flappy_bird.sound_enabled = False
+
+    # soak と同じ自動操縦（打ち切り後は落下する）
+    scalar = [play_scalar(seed, soak.Autopilot(AUTOPILOT_FRAMES)) for seed in AUTOPILOT_SEEDS]
+    compare("autopilot", AUTOPILOT_SEEDS, scalar,
+            play_vector(AUTOPILOT_SEEDS, autopilot_frames=AUTOPILOT_FRAMES))
+
+    # 自動操縦 + ランダムな操作ミス（いろいろなスコアで終わる）
+    noise = np.random.default_rng(5).random((len(NOISY_SEEDS), MAX_FRAMES)) < 0.03
+    scalar = []
+    for g, seed in enumerate(NOISY_SEEDS):
+        pilot = soak.Autopilot(MAX_FRAMES)
+        frame = iter(noise[g])
+        scalar.append(play_scalar(seed, lambda bird, pipes, pilot=pilot, frame=frame:
+                                  pilot(bird, pipes) != bool(next(frame))))
+    compare("noisy", NOISY_SEEDS, scalar, play_vector(NOISY_SEEDS, autopilot_frames=MAX_FRAMES, noise=noise))
+
+    # ランダムなボタン入力
+    actions = np.random.default_rng(7).random((len(RANDOM_SEEDS), MAX_FRAMES)) < 0.15
+    scalar = []
+    for g, seed in enumerate(RANDOM_SEEDS):
+        frame = iter(actions[g])
+        scalar.append(play_scalar(seed, lambda bird, pipes, frame=frame: bool(next(frame))))
+    compare("random", RANDOM_SEEDS, scalar, play_vector(RANDOM_SEEDS, actions))
+
+    flappy_bird.sound_enabled = True
+
+    # スループット
+    for games in (1000, 10000, 100000):
+        scores, frames, elapsed = flappy_sim.evaluate(flappy_sim.FlappySim(games, seed=1))
+        print("[OK] {:>6d} games: {:.1f} M frames/s, mean score {:.2f}".format(
+            games, frames / elapsed / 1e6, scores.mean()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Host check for idle.wait_press()
+
+Uses stand-in pins and a fake sleep function that records how long the
+CPU was parked and presses a button after a number of sleeps. Like
+lightsleep, the fake sleep returns at once when an IRQ is pending, so a
+press between the check and the sleep must not cost MAX_SLEEP_MS.
+
+    python tools/check_idle.py
+"""
+
+import hostenv
+
+hostenv.setup()
+
+import machine  # noqa: E402
+from machine import Pin  # noqa: E402
+import idle  # noqa: E402
+
+
+class FakeSleep:
+    """スリープ時間を記録し、指定回数後にボタンを押す（保留中の IRQ があればすぐ戻る）"""
+
+    def __init__(self, pin, press_after, before_sleep=False):
+        self.pin = pin
+        self.press_after = press_after
+        self.before_sleep = before_sleep
+        self.calls = 0
+        self.parked_ms = 0
+
+    def __call__(self, ms):
+        if self.before_sleep and self.calls == self.press_after:
+            # 押下の確認とスリープの間の押下（IRQ は止めてあるので保留される）
+            self.pin.drive(0)
+        self.calls += 1
+        if machine.irq_pending():
+            return
+        self.parked_ms += ms
+        if not self.before_sleep and self.calls == self.press_after:
+            self.pin.drive(0)
+
+
+def main():
+    a = Pin(28, Pin.IN, Pin.PULL_UP)
+    b = Pin(29, Pin.IN, Pin.PULL_UP)
+
+    fake = FakeSleep(b, press_after=3)
+    pressed = idle.wait_press([a, b], sleeper=fake)
+    assert pressed is b
+    assert fake.calls == 3
+    assert a._handler is None and b._handler is None
+    print("[OK] woke on B after {} sleeps, parked {} ms".format(fake.calls, fake.parked_ms))
+
+    # 押したままのボタンは新しい押下として扱わない（立ち下がりエッジのみ）
+    b.drive(1)
+    a.drive(0)
+    fake = FakeSleep(b, press_after=2)
+    pressed = idle.wait_press([a, b], sleeper=fake)
+    assert pressed is b
+    print("[OK] held button ignored, woke on fresh press")
+
+    # 最初のスリープの前に押された場合も取りこぼさない
+    a.drive(1)
+    b.drive(1)
+    fake = FakeSleep(a, press_after=0, before_sleep=True)
+    pressed = idle.wait_press([a, b], sleeper=fake)
+    assert pressed is a and fake.calls == 1
+    assert fake.parked_ms == 0, fake.parked_ms
+    assert not machine.irq_pending()
+    print("[OK] press racing the sleep is not missed and does not wait {} ms".format(idle.MAX_SLEEP_MS))
+
+
+if __name__ == "__main__":
+    main()
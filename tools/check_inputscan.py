@@ -0,0 +1,94 @@
+"""
+Host check for inputscan.Scanner with the stand-in GPIO_IN register
+
+Drives the button pins through random press/release sequences and
+compares held/pressed/released with a per-pin reference, both for the
+mem32 path (one register read per update) and for the Pin fallback.
+Also checks flappy_bird.read_button() on top of the scanner.
+
+    python tools/check_inputscan.py
+"""
+
+import random
+import time
+
+import hostenv
+
+hostenv.setup()
+
+import machine  # noqa: E402
+import inputscan  # noqa: E402
+import runtime  # noqa: E402
+import flappy_bird  # noqa: E402
+
+STEPS = 5000
+
+
+def reference(levels, prev):
+    """ボタンごとの押下・エッジ（押下で0）"""
+    held = {name for name, v in levels.items() if v == 0}
+    return held, held - prev, prev - held
+
+
+def check_edges(rng):
+    fallback = inputscan.Scanner(runtime.BUTTON_PINS, use_mem32=False)
+    direct = inputscan.Scanner(runtime.BUTTON_PINS)
+    assert direct.direct and not fallback.direct
+    names = list(runtime.BUTTON_PINS)
+    levels = {name: 1 for name in names}
+    prev = set()
+    edges = 0
+    for _ in range(STEPS):
+        # 同時に複数のボタンが変化することもある
+        for name in rng.sample(names, rng.randrange(0, 4)):
+            levels[name] ^= 1
+            fallback.pins[name].drive(levels[name])
+            direct.pins[name].drive(levels[name])
+        reads = machine.mem32.reads
+        direct.update()
+        assert machine.mem32.reads == reads + 1
+        fallback.update()
+        held, pressed, released = reference(levels, prev)
+        prev = held
+        for scanner in (direct, fallback):
+            assert set(scanner.names(scanner.held)) == held
+            assert set(scanner.names(scanner.pressed)) == pressed
+            assert set(scanner.names(scanner.released)) == released
+        edges += len(pressed) + len(released)
+    print("[OK] {} scans, {} edges: mem32 and Pin paths match the per-pin reference".format(STEPS, edges))
+    return direct, fallback
+
+
+def check_read_button():
+    scanner = inputscan.Scanner(runtime.BUTTON_PINS)
+    flappy_bird.buttons = scanner
+    flappy_bird.bit_a = scanner.bit("A")
+    a = scanner.pins["A"]
+    b = scanner.pins["B"]
+    results = []
+    for level_a, level_b in ((1, 1), (0, 1), (0, 1), (0, 0), (1, 0), (0, 0), (1, 1)):
+        a.drive(level_a)
+        b.drive(level_b)
+        results.append(flappy_bird.read_button())
+    assert results == [False, True, False, False, False, True, False], results
+    print("[OK] read_button() fires once per A press and ignores other buttons")
+
+
+def bench(direct, fallback):
+    rounds = 20000
+    for label, scanner in (("mem32", direct), ("Pin", fallback)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scanner.update()
+        print("host: {:<5s} update {:.2f} us".format(label, (time.perf_counter() - start) * 1e6 / rounds))
+
+
+def main():
+    rng = random.Random(1)
+    direct, fallback = check_edges(rng)
+    check_read_button()
+    bench(direct, fallback)
+
+
+if __name__ == "__main__":
+    main()
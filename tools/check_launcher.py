@@ -0,0 +1,94 @@
+"""
+Host check that launcher.run_game() unloads the game
+
+Builds the shared runtime on stand-ins and runs flappy bird through
+launcher.run_game() twice. A fake idle sleep presses the buttons (A on
+the title, A on game over, START to go back to the launcher); without
+presses the bird falls and the game ends by itself. After each run no
+module loaded by the game may remain in sys.modules. The first run
+leaves CPython's import caches behind; after gc.collect() the second run
+must leave the traced heap (tracemalloc) where the first one left it.
+
+    python tools/check_launcher.py
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import hostenv
+
+hostenv.setup()
+
+import idle  # noqa: E402
+import launcher  # noqa: E402
+import runtime  # noqa: E402
+
+GAME = "flappy_bird"
+# 1回のプレイで押すボタン（タイトルで A、ゲームオーバーで A、タイトルで START）
+SCRIPT = ["A", "A", "START"]
+# 2回目のプレイの後に残ってよい割り当て（CPython の import の内部キャッシュが数百バイト
+# 増えることがある。ゲームのモジュールが1つでも残れば数KB以上になる）
+TOLERANCE = 1024
+
+
+class ScriptedSleep:
+    """idle.wait_press() のスリープの代わりに、台本どおりボタンを押す"""
+
+    def __init__(self, rt, script):
+        self.rt = rt
+        self.script = list(script)
+        self.presses = 0
+
+    def __call__(self, ms):
+        if not self.script:
+            raise AssertionError("unexpected wait_press()")
+        for pin in self.rt.buttons.values():
+            pin.drive(1)
+        # IRQ は止めてあるので保留され、wait_press() が IRQ を戻したときに届く
+        self.rt.buttons[self.script.pop(0)].drive(0)
+        self.presses += 1
+
+
+def play(rt):
+    sleeper = ScriptedSleep(rt, SCRIPT)
+    idle.sleep = sleeper
+    try:
+        launcher.run_game(rt, GAME)
+    finally:
+        idle.sleep = idle._lightsleep
+    assert not sleeper.script, sleeper.script
+    for pin in rt.buttons.values():
+        pin.drive(1)
+    return sleeper.presses
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        runtime.STORE_PATH = os.path.join(tmp, "store.dat")
+        rt = runtime.get()
+        assert GAME not in sys.modules
+        modules = set(sys.modules)
+        tracemalloc.start()
+        try:
+            gc.collect()
+            heap = [tracemalloc.get_traced_memory()[0]]
+            for run in (1, 2):
+                presses = play(rt)
+                left = set(sys.modules) - modules
+                assert not left, left
+                gc.collect()
+                heap.append(tracemalloc.get_traced_memory()[0])
+                print("[OK] run {}: {} presses, no game modules left in sys.modules, "
+                      "heap delta {} B after gc.collect()".format(run, presses, heap[-1] - heap[-2]))
+        finally:
+            tracemalloc.stop()
+        delta = heap[2] - heap[1]
+        assert abs(delta) < TOLERANCE, delta
+        print("[OK] second run returns the heap to where the first left it ({} B)".format(delta))
+
+
+if __name__ == "__main__":
+    main()
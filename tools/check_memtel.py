@@ -0,0 +1,97 @@
+"""
+Host check of allocation budgets with memtel
+
+Enables memtel (tracemalloc on CPython), builds the display and plays a
+few autopiloted flappy bird games. Then runs flappy_bird.run() on the
+stand-in runtime with scripted button presses (check_launcher's
+ScriptedSleep), once with a title.img and once without, so the title,
+game and game-over phases are measured too. Fails if any instrumented
+phase allocated more than its budget. A phase with a deliberately tiny
+budget checks that violations are reported.
+
+    python tools/check_memtel.py
+"""
+
+import os
+import random
+import struct
+import tempfile
+
+import hostenv
+
+hostenv.setup()
+
+import memtel  # noqa: E402
+
+memtel.enable()
+
+import flappy_bird  # noqa: E402
+import idle  # noqa: E402
+import img2rgb565  # noqa: E402
+import runtime  # noqa: E402
+import soak  # noqa: E402
+from check_launcher import SCRIPT, ScriptedSleep  # noqa: E402
+
+
+def write_title(path):
+    """RLE のタイトル画像（縦じま）"""
+    pixels = [(x // 8) * 0x0841 for _ in range(160) for x in range(128)]
+    with open(path, "wb") as f:
+        f.write(struct.pack(img2rgb565.HEADER, img2rgb565.MAGIC, 128, 160, img2rgb565.FLAG_RLE))
+        f.write(img2rgb565.encode_rle(pixels))
+
+
+def play_session(rt, title):
+    """タイトル → ゲーム → ゲームオーバー → タイトル（STARTで終了）を1回"""
+    flappy_bird.TITLE_IMAGE = title
+    sleeper = ScriptedSleep(rt, SCRIPT)
+    idle.sleep = sleeper
+    try:
+        flappy_bird.run(rt)
+    finally:
+        idle.sleep = idle._lightsleep
+    assert not sleeper.script, sleeper.script
+    for pin in rt.buttons.values():
+        pin.drive(1)
+
+
+def main():
+    flappy_bird.display = hostenv.make_display()
+    flappy_bird.sound_enabled = False
+    random.seed(1)
+    for _ in range(3):
+        flappy_bird.main_game(soak.Autopilot(200), 0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runtime.STORE_PATH = os.path.join(tmp, "store.dat")
+        rt = runtime.get()
+        title = os.path.join(tmp, "title.img")
+        write_title(title)
+        # 画像のタイトル画面と、画像がないときの文字のタイトル画面
+        play_session(rt, title)
+        play_session(rt, os.path.join(tmp, "missing.img"))
+
+    memtel.report()
+    frame = memtel.get("flappy.frame")
+    assert frame["count"] >= 600, frame
+    for name, count in (("flappy.title", 4), ("flappy.game", 2), ("flappy.over", 2)):
+        assert memtel.get(name)["count"] == count, (name, memtel.get(name))
+    memtel.check()
+    print("[OK] no phase exceeded its allocation budget")
+
+    # 上限を超えたフェーズは check() で失敗する
+    pid = memtel.phase("check.leak", 16)
+    memtel.begin(pid)
+    leak = [bytearray(64) for _ in range(4)]
+    memtel.end(pid)
+    try:
+        memtel.check()
+    except AssertionError as e:
+        print("[OK] over-budget phase detected: {}".format(e))
+    else:
+        raise AssertionError("budget violation not detected")
+    del leak
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compile every device module with mpy-cross for the RP2040 (armv6m)
+
+The host stand-in makes micropython.viper a no-op, so viper type errors
+(e.g. indexing a pointer with a non-const global) only show up when the
+module is compiled for the board. This runs mpy-cross on
+projects/flappy_bird/*.py and tests/*.py and fails on the first error.
+
+    pip install mpy-cross
+    python tools/check_mpy.py
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = ("projects/flappy_bird/*.py", "tests/*.py")
+ARCH = "armv6m"
+
+
+def compiler():
+    """mpy-cross の起動コマンド（pip の mpy_cross パッケージか PATH 上の実行ファイル）"""
+    try:
+        import mpy_cross  # noqa: F401
+    except ImportError:
+        path = shutil.which("mpy-cross")
+        if path is None:
+            raise SystemExit("mpy-cross not found: pip install mpy-cross")
+        return [path]
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def main():
+    command = compiler()
+    paths = sorted(p for pattern in SOURCES for p in glob.glob(os.path.join(ROOT, pattern)))
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in paths:
+            out = os.path.join(tmp, os.path.basename(path)[:-3] + ".mpy")
+            result = subprocess.run(command + ["-march=" + ARCH, "-o", out, path],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                failed.append(os.path.relpath(path, ROOT))
+                print(result.stderr.strip() or result.stdout.strip())
+    assert not failed, "mpy-cross failed: " + ", ".join(failed)
+    print("[OK] {} modules compile for {}".format(len(paths), ARCH))
+
+
+if __name__ == "__main__":
+    main()
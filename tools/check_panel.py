@@ -0,0 +1,151 @@
+"""
+Host check of the ST7735 driver against the panel emulator
+
+For every rotation this verifies the MADCTL value, that CASET/RASET
+include xoffset/yoffset, that consecutive show() calls land pixel-exactly
+in GRAM without touching pixels outside the glass, and that direct fills
+match the framebuffer path. Finally it reports the bus time and the
+frame-rate ceiling of a full-frame flush.
+
+Both copies of the driver are checked (projects/flappy_bird/st7735.py
+and tests/st7735.py), as well as runtime.make_display() with every
+stored rotation.
+
+    python tools/check_panel.py
+"""
+
+import importlib.util
+import os
+import sys
+
+import hostenv
+from st7735_emu import PanelEmulator, MADCTL, CASET, RASET
+
+hostenv.setup()
+sys.path.append(os.path.join(hostenv.ROOT_DIR, "tests"))
+
+import st7735  # noqa: E402  projects/flappy_bird/st7735.py
+import runtime  # noqa: E402
+import rotation_test  # noqa: E402
+
+# 検証するドライバ（プロジェクト版と tests/ 版）
+DRIVERS = [("projects/flappy_bird/st7735.py", st7735)]
+
+# 回転ごとの (width, height, MADCTL(bgr=False))
+ROTATIONS = {
+    0: (128, 160, 0xC0),
+    90: (160, 128, 0x60),
+    180: (128, 160, 0x00),
+    270: (160, 128, 0xA0),
+}
+XOFFSET = 2
+YOFFSET = 1
+
+
+def load_driver(path):
+    """パスを指定してドライバを別モジュールとして読み込む"""
+    spec = importlib.util.spec_from_file_location("st7735_" + path.replace("/", "_")[:-3],
+                                                  os.path.join(hostenv.ROOT_DIR, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make(rotation, baudrate=20000000, driver=st7735):
+    width, height, _ = ROTATIONS[rotation]
+    emu = PanelEmulator(baudrate=baudrate)
+    display = driver.ST7735(emu.spi, cs=emu.cs, dc=emu.dc, rst=emu.rst, width=width, height=height,
+                            bgr=False, xoffset=XOFFSET, yoffset=YOFFSET, rotation=rotation)
+    display.init()
+    return emu, display
+
+
+def offsets(rotation):
+    if rotation in (90, 270):
+        return YOFFSET, XOFFSET
+    return XOFFSET, YOFFSET
+
+
+def pattern(display, seed):
+    display.fill(0x0000)
+    for i in range(12):
+        display.fill_rect((i * 37 + seed) % display.width, (i * 53 + seed) % display.height,
+                          20, 15, (i * 4099 + seed * 31) & 0xFFFF)
+    display.line(0, 0, display.width - 1, display.height - 1, 0xFFFF)
+
+
+def check_rotation(rotation, label, driver):
+    width, height, madctl = ROTATIONS[rotation]
+    emu, display = make(rotation, driver=driver)
+    assert emu.madctl == madctl, hex(emu.madctl)
+    col_off, row_off = offsets(rotation)
+
+    for seed in (1, 2, 3):
+        emu.clear_written()
+        emu.log = []
+        pattern(display, seed)
+        display.show()
+        assert emu.caset == (col_off, col_off + width - 1), emu.caset
+        assert emu.raset == (row_off, row_off + height - 1), emu.raset
+        assert emu.log[:2] == [CASET, RASET]
+        got = emu.readback(0, 0, width, height, col_off, row_off)
+        assert got == display.buffer, "frame {} differs".format(seed)
+        assert emu.stray_pixels() == 0
+        assert sum(emu.written) == 128 * 160
+
+    # 直接描画はフレームバッファ経由と同じ結果になる
+    display.fill_rect_direct(10, 20, 30, 40, 0xF800)
+    display.fill_rect(10, 20, 30, 40, 0xF800)
+    got = emu.readback(0, 0, width, height, col_off, row_off)
+    assert got == display.buffer
+    assert not emu.errors, emu.errors
+    print("[OK] {} rotation {:3d}: MADCTL=0x{:02X} window {}x{} +({}, {})".format(
+        label, rotation, madctl, width, height, col_off, row_off))
+
+
+def check_runtime_rotations():
+    """保存された rot がどの値でも GRAM の外に書かない（縦向き以外は 180 に戻す）"""
+    for rot in (0, 90, 180, 270, 45):
+        emu = PanelEmulator()
+        cfg = {"rot": rot, "xoff": XOFFSET, "yoff": YOFFSET}
+        display = runtime.make_display(emu.spi, emu.cs, emu.dc, emu.rst, cfg)
+        expected = rot if rot in runtime.PORTRAIT_ROTATIONS else runtime.DEFAULT_ROTATION
+        assert display.rotation == expected, (rot, display.rotation)
+        pattern(display, 1)
+        display.show()
+        col_off, row_off = offsets(display.rotation)
+        assert emu.readback(0, 0, display.width, display.height, col_off, row_off) == display.buffer
+        assert emu.stray_pixels() == 0 and not emu.errors, rot
+    print("[OK] runtime.make_display: stored rot 0/90/180/270/45 stays inside GRAM")
+
+
+def check_test_screens():
+    emu, display = make(180)
+    rotation_test.rotation_test_screen(display)
+    got = emu.readback(0, 0, 128, 160, XOFFSET, YOFFSET)
+    assert got == display.buffer
+    print("[OK] rotation_test_screen matches GRAM")
+
+
+def report_bus_time():
+    for baudrate in (10000000, 20000000, 62500000):
+        emu, display = make(180, baudrate)
+        with emu.measure() as m:
+            display.show()
+        print("full show() @ {:2d} MHz: {} bytes, {:.2f} ms bus time, ceiling {:.1f} fps".format(
+            baudrate // 1000000, m.bytes, m.bus_us / 1000, m.fps_ceiling))
+
+
+def main():
+    assert MADCTL == st7735.ST7735_MADCTL
+    drivers = DRIVERS + [("tests/st7735.py", load_driver("tests/st7735.py"))]
+    for label, driver in drivers:
+        for rotation in ROTATIONS:
+            check_rotation(rotation, label, driver)
+    check_runtime_rotations()
+    check_test_screens()
+    report_bus_time()
+
+
+if __name__ == "__main__":
+    main()
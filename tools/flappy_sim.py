@@ -0,0 +1,266 @@
+"""
+Vectorized flappy bird simulator for batch evaluation (needs NumPy)
+
+Runs thousands of games in parallel with the same rules as
+flappy_bird.main_game(): Bird.update(), Pipe.update(), the score check,
+Pipe.collides_with() for the tilted bird mask, the ground check and the
+pipe respawn, in that order. Constants default to the ones in
+projects/flappy_bird/flappy_bird.py.
+
+    sim = FlappySim(4096, seed=1)
+    obs = sim.reset()
+    while not sim.done.all():
+        obs, scores, done = sim.step(policy(obs))
+
+Difficulty sweep from the command line:
+
+    python tools/flappy_sim.py --games 20000 --gap 36 --speed 3
+
+Pipe gaps come from a NumPy generator, or from a table of gaps
+(gaps[game, k] = gap of the k-th pipe of that game). random_gaps()
+builds the table the scalar game would draw after random.seed(seed).
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+import hostenv
+
+hostenv.setup()
+
+import flappy_bird as game  # noqa: E402
+
+# main_game() / Bird / draw_background() のリテラルと同じ値
+BIRD_X = 30
+GROUND_HEIGHT = 20
+PIPE_COUNT = 3
+PIPE_SPACING = 80
+GAP_MARGIN = 30
+
+# 観測の列
+OBS_Y = 0         # 鳥の y
+OBS_VELOCITY = 1  # 鳥の速度
+OBS_PIPE_X = 2    # 鳥の前にある最初のパイプの x
+OBS_GAP_Y = 3     # そのパイプの隙間の上端
+OBS_SIZE = 4
+
+
+# マスクの行ビットの上限（8x8 の鳥は回転しても 12 行）
+MAX_ROWS = 16
+# LOW_BITS[k] = 下位 k ビットが立った値
+LOW_BITS = (1 << np.arange(MAX_ROWS + 1, dtype=np.int32)) - 1
+
+
+def bird_rows(pipe_width=game.PIPE_WIDTH):
+    """
+    傾きごとの鳥のマスクを、パイプと重なる列の範囲ごとの不透明な行のビットにまとめる
+
+    Returns:
+        (rows, ox, oy): rows[tilt, dx + pipe_width] のビット r は、パイプの左端がマスクの
+        左端から dx の位置にあるとき、マスクの r 行目にパイプと重なる不透明なピクセルが
+        あれば 1。ox/oy は傾きごとの描画位置のずれ
+    """
+    tilts = range(game.BIRD_TILT_MIN, game.BIRD_TILT_MAX + 1)
+    variants = [game.sprite_cache.get(game.BIRD_SPRITE, tilt) for tilt in tilts]
+    max_w = max(v.width for v in variants)
+    if max(v.height for v in variants) > MAX_ROWS:
+        raise ValueError("bird mask taller than MAX_ROWS")
+    rows = np.zeros((len(variants), max_w + pipe_width + 1), dtype=np.int32)
+    for t, v in enumerate(variants):
+        opaque = np.array([[v.mask.fbuf.pixel(x, y) for x in range(v.width)] for y in range(v.height)],
+                          dtype=bool)
+        for dx in range(-pipe_width, v.width):
+            hit_rows = opaque[:, max(dx, 0):dx + pipe_width].any(axis=1)
+            rows[t, dx + pipe_width] = int((hit_rows << np.arange(v.height)).sum())
+    ox = np.array([v.ox for v in variants], dtype=np.int32)
+    oy = np.array([v.oy for v in variants], dtype=np.int32)
+    return rows, ox, oy
+
+
+def row_bits(lo, hi):
+    """マスクの行 [lo, hi) のビット（範囲は 0..MAX_ROWS に切り詰める）"""
+    lo = np.clip(lo, 0, MAX_ROWS)
+    hi = np.clip(hi, 0, MAX_ROWS)
+    return LOW_BITS[hi] & ~LOW_BITS[lo]
+
+
+def random_gaps(seeds, count, gap=game.PIPE_GAP):
+    """random.seed(seed) 後にスカラー版が引く隙間の位置を (len(seeds), count) の表で返す"""
+    rng = random.Random()
+    table = np.empty((len(seeds), count), dtype=np.int32)
+    for i, seed in enumerate(seeds):
+        rng.seed(seed)
+        table[i] = [rng.randint(GAP_MARGIN, game.SCREEN_HEIGHT - gap - GAP_MARGIN) for _ in range(count)]
+    return table
+
+
+class FlappySim:
+    def __init__(self, games, seed=0, gaps=None, gap=game.PIPE_GAP, speed=game.PIPE_SPEED,
+                 gravity=game.GRAVITY, jump=game.JUMP_STRENGTH):
+        """
+        Args:
+            games: number of parallel games
+            seed: seed of the NumPy gap generator (ignored with gaps)
+            gaps: optional int table (games, pipes) of gap positions
+            gap, speed, gravity, jump: PIPE_GAP, PIPE_SPEED, GRAVITY, JUMP_STRENGTH
+        """
+        self.games = games
+        self.gap = gap
+        self.speed = speed
+        self.gravity = gravity
+        self.jump = jump
+        self.seed = seed
+        self.gaps = None if gaps is None else np.asarray(gaps, dtype=np.int32)
+        if self.gaps is not None and self.gaps.shape[0] != games:
+            raise ValueError("gaps must have one row per game")
+        self.rows, self.ox, self.oy = bird_rows()
+        self.reset()
+
+    def _draw_gaps(self, rows):
+        """rows のゲームに次のパイプの隙間を引く"""
+        if self.gaps is None:
+            return self.rng.integers(GAP_MARGIN, game.SCREEN_HEIGHT - self.gap - GAP_MARGIN,
+                                     size=len(rows), endpoint=True, dtype=np.int32)
+        k = self.spawned[rows]
+        if (k >= self.gaps.shape[1]).any():
+            raise IndexError("gap table too short")
+        self.spawned[rows] = k + 1
+        return self.gaps[rows, k]
+
+    def reset(self):
+        """すべてのゲームを開始状態に戻し、観測を返す"""
+        n = self.games
+        self.rng = np.random.default_rng(self.seed)
+        self.y = np.full(n, game.SCREEN_HEIGHT // 2, dtype=np.int32)
+        self.velocity = np.zeros(n, dtype=np.int32)
+        # パイプは常に PIPE_SPACING 間隔で並ぶので先頭の x だけを持つ
+        self.pipe_x = np.full(n, game.SCREEN_WIDTH, dtype=np.int32)
+        self.spawned = np.zeros(n, dtype=np.int32)
+        all_rows = np.arange(n)
+        self.gap_y = np.empty((n, PIPE_COUNT), dtype=np.int32)
+        for k in range(PIPE_COUNT):
+            self.gap_y[:, k] = self._draw_gaps(all_rows)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.frames = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+        return self.observe()
+
+    def observe(self):
+        """(games, OBS_SIZE) の観測（鳥の前にある最初のパイプを対象にする）"""
+        behind = self.pipe_x + game.PIPE_WIDTH < BIRD_X
+        obs = np.empty((self.games, OBS_SIZE), dtype=np.int32)
+        obs[:, OBS_Y] = self.y
+        obs[:, OBS_VELOCITY] = self.velocity
+        obs[:, OBS_PIPE_X] = self.pipe_x + behind * PIPE_SPACING
+        obs[:, OBS_GAP_Y] = np.where(behind, self.gap_y[:, 1], self.gap_y[:, 0])
+        return obs
+
+    def step(self, actions):
+        """
+        1フレーム進める（終了したゲームはそのまま）
+
+        Args:
+            actions: bool array (games,), True = jump
+        Returns:
+            (observations, scores, done)
+        """
+        live = ~self.done
+        size = game.BIRD_SIZE
+        height = game.SCREEN_HEIGHT
+        width = game.PIPE_WIDTH
+
+        # Bird.jump() / Bird.update()
+        velocity = np.where(actions, self.jump, self.velocity) + self.gravity
+        y = self.y + velocity
+        clamp = (y < 0) | (y > height - size)
+        y = np.clip(y, 0, height - size)
+        velocity[clamp] = 0
+
+        # Bird.tilt() / Bird.variant(): 傾きのマスクの位置
+        tilt = np.clip(velocity // 2, game.BIRD_TILT_MIN, game.BIRD_TILT_MAX) - game.BIRD_TILT_MIN
+        mask_x = BIRD_X + self.ox[tilt]
+        mask_y = y + self.oy[tilt]
+
+        # Pipe.update() とスコア（パイプが鳥の左を通り過ぎたフレームで1点）
+        old_x = self.pipe_x
+        pipe_x = old_x - self.speed
+        crossed = np.zeros(self.games, dtype=np.int32)
+        hit = np.zeros(self.games, dtype=bool)
+        for k in range(PIPE_COUNT):
+            x = pipe_x + k * PIPE_SPACING
+            crossed += (x + width < BIRD_X) & (old_x + k * PIPE_SPACING + width >= BIRD_X)
+            # Pipe.collides_with(): 傾いた鳥のマスクと上下のパイプの矩形
+            # （上のパイプは y = 0..gap_y、下のパイプは gap_y + gap..画面の下端）
+            dx = np.clip(x - mask_x, -width, self.rows.shape[1] - width - 1)
+            gap_y = self.gap_y[:, k]
+            pipe_rows = (row_bits(-mask_y, gap_y - mask_y)
+                         | row_bits(gap_y + self.gap - mask_y, height - mask_y))
+            hit |= (self.rows[tilt, dx + width] & pipe_rows) != 0
+
+        # 地面との衝突
+        over = hit | (y >= height - GROUND_HEIGHT - size)
+
+        np.copyto(self.y, y, where=live)
+        np.copyto(self.velocity, velocity, where=live)
+        np.copyto(self.pipe_x, pipe_x, where=live)
+        self.score += crossed * live
+        self.frames += live
+        self.done |= over
+
+        # パイプの再生成（ゲームオーバーのフレームでは行わない）
+        respawn = np.flatnonzero(live & ~over & (self.pipe_x + width < 0))
+        if len(respawn):
+            self.pipe_x[respawn] += PIPE_SPACING
+            self.gap_y[respawn, :-1] = self.gap_y[respawn, 1:]
+            self.gap_y[respawn, -1] = self._draw_gaps(respawn)
+
+        return self.observe(), self.score, self.done
+
+
+def autopilot(obs, gravity=game.GRAVITY, gap=game.PIPE_GAP):
+    """soak.Autopilot と同じ判断（落下中で、次のフレームに隙間の下端に近づきすぎるならジャンプ）"""
+    y = obs[:, OBS_Y]
+    velocity = obs[:, OBS_VELOCITY]
+    next_y = y + velocity + gravity
+    return (velocity >= 0) & (next_y + game.BIRD_SIZE > obs[:, OBS_GAP_Y] + gap - 6)
+
+
+def evaluate(sim, max_frames=3000):
+    """自動操縦で全ゲームを終了まで進め、(スコア, 総フレーム数, 秒) を返す"""
+    obs = sim.reset()
+    start = time.perf_counter()
+    steps = 0
+    while not sim.done.all():
+        steps += 1
+        actions = autopilot(obs, sim.gravity, sim.gap) & (steps <= max_frames)
+        obs, scores, done = sim.step(actions)
+    elapsed = time.perf_counter() - start
+    return sim.score.copy(), int(sim.frames.sum()), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch flappy bird simulation with the soak autopilot")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--gap", type=int, default=game.PIPE_GAP, help="PIPE_GAP")
+    parser.add_argument("--speed", type=int, default=game.PIPE_SPEED, help="PIPE_SPEED")
+    parser.add_argument("--gravity", type=int, default=game.GRAVITY, help="GRAVITY")
+    parser.add_argument("--jump", type=int, default=game.JUMP_STRENGTH, help="JUMP_STRENGTH")
+    parser.add_argument("--max-frames", type=int, default=3000, help="autopilot gives up after this")
+    args = parser.parse_args(argv)
+
+    sim = FlappySim(args.games, seed=args.seed, gap=args.gap, speed=args.speed,
+                    gravity=args.gravity, jump=args.jump)
+    scores, frames, elapsed = evaluate(sim, args.max_frames)
+    print("games={} gap={} speed={} gravity={} jump={}".format(
+        args.games, args.gap, args.speed, args.gravity, args.jump))
+    print("score mean={:.2f} median={:.0f} p10={:.0f} p90={:.0f} max={}".format(
+        scores.mean(), np.median(scores), np.percentile(scores, 10), np.percentile(scores, 90), scores.max()))
+    print("{} frames in {:.2f} s ({:.1f} M frames/s)".format(frames, elapsed, frames / elapsed / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Host stand-in for the MicroPython `framebuf` module
+
+Pure-Python implementation of the subset used in this repository
+(RGB565 and MONO_HLSB). Pixel memory layout matches MicroPython, so
+buffers can be byte-compared against device output.
+
+Note: text() draws deterministic stand-in glyphs, not the firmware's
+8x8 font. Compare host-rendered text only against host-rendered text.
+"""
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+
+def _glyph(ch):
+    """文字コードから決定的な8x8パターンを生成（スペースは空白）"""
+    code = ord(ch)
+    if code <= 32:
+        return bytes(8)
+    rows = []
+    for r in range(8):
+        if r == 0 or r == 7:
+            rows.append(0)
+        else:
+            rows.append(((code * 2654435761 + r * 40503) >> 13) & 0x7E)
+    return bytes(rows)
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in (RGB565, MONO_HLSB, GS8):
+            raise ValueError("unsupported format")
+        self.buffer = memoryview(buffer).cast("B")
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+
+    # --- 低レベルアクセス ---
+    def _set(self, x, y, c):
+        if self.format == RGB565:
+            i = (y * self.stride + x) * 2
+            self.buffer[i] = c & 0xFF
+            self.buffer[i + 1] = (c >> 8) & 0xFF
+        elif self.format == GS8:
+            self.buffer[y * self.stride + x] = c & 0xFF
+        else:
+            i = (y * self.stride + x) >> 3
+            bit = 0x80 >> (x & 7)
+            if c:
+                self.buffer[i] |= bit
+            else:
+                self.buffer[i] &= ~bit & 0xFF
+
+    def _get(self, x, y):
+        if self.format == RGB565:
+            i = (y * self.stride + x) * 2
+            return self.buffer[i] | (self.buffer[i + 1] << 8)
+        if self.format == GS8:
+            return self.buffer[y * self.stride + x]
+        return (self.buffer[(y * self.stride + x) >> 3] >> (7 - (x & 7))) & 1
+
+    # --- 描画API ---
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.format == RGB565:
+            run = bytes((c & 0xFF, (c >> 8) & 0xFF)) * (x1 - x0)
+            for yy in range(y0, y1):
+                i = (yy * self.stride + x0) * 2
+                self.buffer[i:i + len(run)] = run
+        elif self.format == GS8:
+            run = bytes((c & 0xFF,)) * (x1 - x0)
+            for yy in range(y0, y1):
+                i = yy * self.stride + x0
+                self.buffer[i:i + len(run)] = run
+        else:
+            for yy in range(y0, y1):
+                for xx in range(x0, x1):
+                    self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def text(self, s, x, y, c=1):
+        for ch in s:
+            rows = _glyph(ch)
+            for r in range(8):
+                bits = rows[r]
+                for b in range(8):
+                    if bits & (0x80 >> b):
+                        self.pixel(x + b, y + r, c)
+            x += 8
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for sy in range(fbuf.height):
+            dy = y + sy
+            if not 0 <= dy < self.height:
+                continue
+            for sx in range(fbuf.width):
+                dx = x + sx
+                if not 0 <= dx < self.width:
+                    continue
+                c = fbuf._get(sx, sy)
+                if c == key:
+                    continue
+                if palette is not None:
+                    c = palette._get(c, 0)
+                self._set(dx, dy, c)
@@ -0,0 +1,161 @@
+"""
+Host stand-in for the MicroPython `machine` module
+
+Pins keep their level in memory and can be driven from a test with
+`Pin.drive()`. SPI counts written bytes and forwards every write to an
+optional `on_write` hook (used by recorders and the panel emulator).
+`mem32` reads the SIO GPIO_IN register from the pin levels; other
+addresses behave as plain memory. While IRQs are disabled with
+`disable_irq()`, pin handlers are held pending and run in
+`enable_irq()`; `irq_pending()` (host only) tells whether one is held.
+"""
+
+# disable_irq() 中は保留した IRQ ハンドラ (handler, pin) をここに溜める
+_irq_enabled = True
+_pending = []
+
+
+def disable_irq():
+    global _irq_enabled
+    state = _irq_enabled
+    _irq_enabled = False
+    return state
+
+
+def enable_irq(state=True):
+    global _irq_enabled
+    _irq_enabled = state
+    if state:
+        while _pending:
+            handler, pin = _pending.pop(0)
+            handler(pin)
+
+
+def irq_pending():
+    """保留中の IRQ があるか（ホスト専用。スリープがすぐ戻るかの判定に使う）"""
+    return bool(_pending)
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    # GPIO番号 -> 最後に作られた Pin（mem32 の GPIO_IN で読む）
+    _pins = {}
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        Pin._pins[id] = self
+        self.mode = mode
+        self.pull = pull
+        # プルアップ入力は未押下(1)で開始
+        self._value = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            self._value = value
+        self._handler = None
+        self._trigger = 0
+
+    def __repr__(self):
+        return "Pin(GPIO{})".format(self.id)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        self.mode = mode
+        if value is not None:
+            self._value = value
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self._handler = handler
+        self._trigger = trigger if handler else 0
+
+    def drive(self, v):
+        """外部から入力レベルを変更し、該当エッジならIRQハンドラを呼ぶ"""
+        v = 1 if v else 0
+        old = self._value
+        self._value = v
+        if self._handler is None or old == v:
+            return
+        if (v == 0 and self._trigger & Pin.IRQ_FALLING) or (v == 1 and self._trigger & Pin.IRQ_RISING):
+            if _irq_enabled:
+                self._handler(self)
+            else:
+                _pending.append((self._handler, self))
+
+
+class _Mem32:
+    GPIO_IN = 0xD0000004
+
+    def __init__(self):
+        self._mem = {}
+        self.reads = 0
+
+    def __getitem__(self, addr):
+        self.reads += 1
+        if addr == self.GPIO_IN:
+            value = 0
+            for gpio, pin in Pin._pins.items():
+                if isinstance(gpio, int) and 0 <= gpio < 30 and pin._value:
+                    value |= 1 << gpio
+            return value
+        return self._mem.get(addr, 0)
+
+    def __setitem__(self, addr, value):
+        self._mem[addr] = value & 0xFFFFFFFF
+
+
+mem32 = _Mem32()
+
+
+class SPI:
+    def __init__(self, id, baudrate=1000000, polarity=0, phase=0, sck=None, mosi=None, miso=None):
+        self.id = id
+        self.baudrate = baudrate
+        self.bytes_written = 0
+        self.on_write = None
+
+    def write(self, buf):
+        self.bytes_written += len(buf)
+        if self.on_write is not None:
+            self.on_write(buf)
+
+
+class PWM:
+    def __init__(self, pin):
+        self.pin = pin
+        self._freq = 0
+        self._duty = 0
+
+    def freq(self, f=None):
+        if f is None:
+            return self._freq
+        self._freq = f
+
+    def duty_u16(self, d=None):
+        if d is None:
+            return self._duty
+        self._duty = d
+
+    def deinit(self):
+        self._duty = 0
+
+
+def lightsleep(ms=None):
+    pass
+
+
+def idle():
+    pass
@@ -0,0 +1,42 @@
+"""
+Host stand-in for the MicroPython `micropython` module
+
+Code generation decorators become no-ops so that viper/native code runs
+as plain CPython, and the viper pointer builtins (ptr8/ptr16/ptr32) are
+provided as memoryview casts.
+"""
+
+import builtins
+
+
+def viper(func):
+    return func
+
+
+def native(func):
+    return func
+
+
+def const(value):
+    return value
+
+
+def mem_info(*args):
+    pass
+
+
+def _ptr(fmt):
+    def cast(obj):
+        mv = obj if isinstance(obj, memoryview) else memoryview(obj)
+        mv = mv.cast("B")
+        if fmt == "B":
+            return mv
+        # 端数のバイトは ptr16/ptr32 からは見えない（デバイスと同じく ptr8 で処理する）
+        size = 2 if fmt == "H" else 4
+        return mv[:len(mv) - len(mv) % size].cast(fmt)
+    return cast
+
+
+builtins.ptr8 = _ptr("B")
+builtins.ptr16 = _ptr("H")
+builtins.ptr32 = _ptr("I")
@@ -0,0 +1,83 @@
+"""
+Host environment for running device code under CPython
+
+    import hostenv
+    hostenv.setup()          # add stand-ins and projects/flappy_bird to sys.path
+    import st7735
+    display = hostenv.make_display()   # real driver on stand-in SPI/pins
+
+Puts tools/host (machine, micropython, framebuf stand-ins) and the
+project directory on sys.path and adds the MicroPython `time` extensions.
+"""
+
+import os
+import sys
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TOOLS_DIR)
+
+# sleep_ms/sleep_us で実際に待つかどうか（Falseならすぐ戻る）
+realtime = False
+# 待つ代わりに積算した時間 (ms)
+slept_ms = 0
+
+
+def _sleep_ms(ms):
+    global slept_ms
+    slept_ms += ms
+    if realtime:
+        time.sleep(ms / 1000)
+
+
+def _sleep_us(us):
+    _sleep_ms(us / 1000)
+
+
+def _ticks_ms():
+    return int(time.perf_counter() * 1000)
+
+
+def _ticks_us():
+    return int(time.perf_counter() * 1000000)
+
+
+def _ticks_diff(a, b):
+    return a - b
+
+
+def _ticks_add(a, b):
+    return a + b
+
+
+def setup(project="flappy_bird", sleep=False):
+    """スタンドインとプロジェクトのディレクトリを sys.path に追加する"""
+    global realtime
+    realtime = sleep
+    project_dir = os.path.join(ROOT_DIR, "projects", project)
+    for path in (project_dir, os.path.join(TOOLS_DIR, "host")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    time.sleep_ms = _sleep_ms
+    time.sleep_us = _sleep_us
+    time.ticks_ms = _ticks_ms
+    time.ticks_us = _ticks_us
+    time.ticks_diff = _ticks_diff
+    time.ticks_add = _ticks_add
+    import micropython  # noqa: F401  ptr8/ptr16/ptr32 を組み込みに登録
+    if os.path.exists(os.path.join(project_dir, "kernels.py")):
+        import kernels
+        # ホストの計測結果はデバイスと無関係なのでキャッシュファイルを書かない
+        kernels.CACHE_FILE = None
+
+
+def make_display(rotation=180, baudrate=20000000):
+    """runtime と同じ配線・既定のキャリブレーションで ST7735 を作る（SPI は display.spi）"""
+    from machine import Pin, SPI
+    import st7735
+    width, height = (160, 128) if rotation in (90, 270) else (128, 160)
+    display = st7735.ST7735(SPI(0, baudrate=baudrate), cs=Pin(6, Pin.OUT), dc=Pin(5, Pin.OUT),
+                            rst=Pin(4, Pin.OUT), width=width, height=height, bgr=False,
+                            xoffset=2, yoffset=1, rotation=rotation)
+    display.init()
+    return display
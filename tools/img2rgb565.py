@@ -0,0 +1,233 @@
+"""
+PNG -> RGB565 image asset converter (host side)
+
+Converts a PNG file into the raw big-endian RGB565 format that
+`assets.show_image()` streams straight to the ST7735 panel.
+No third-party packages are required (PNG is decoded with zlib).
+
+Usage:
+    python tools/img2rgb565.py title.png title.img
+    python tools/img2rgb565.py --rle --bg 5D9F title.png title.img
+
+File format:
+    header  : b"R565", width (u16 BE), height (u16 BE), flags (u16 BE)
+    payload : flags & FLAG_RLE == 0 -> width * height pixels, RGB565 BE
+              flags & FLAG_RLE != 0 -> RLE packets (see encode_rle)
+"""
+
+import argparse
+import struct
+import sys
+import zlib
+
+MAGIC = b"R565"
+HEADER = ">4sHHH"
+HEADER_SIZE = struct.calcsize(HEADER)
+FLAG_RLE = 0x0001
+
+# RLEパケットの最大ピクセル数（ヘッダ1バイトの下位7ビット + 1）
+RLE_MAX = 128
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def read_png(path):
+    """PNGを読み込み (width, height, rows) を返す（rowsは (r, g, b, a) のリスト）"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("not a PNG file: " + path)
+
+    pos = 8
+    idat = []
+    palette = None
+    trns = None
+    width = height = depth = ctype = interlace = None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = [tuple(body[i:i + 3]) for i in range(0, len(body), 3)]
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+
+    if depth != 8 or interlace:
+        raise ValueError("only 8-bit, non-interlaced PNG is supported")
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(ctype)
+    if channels is None:
+        raise ValueError("unsupported PNG color type: %d" % ctype)
+
+    raw = zlib.decompress(b"".join(idat))
+    stride = width * channels
+    prev = bytearray(stride)
+    rows = []
+    pos = 0
+    for _ in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        # スキャンラインフィルタを復元
+        for i in range(stride):
+            a = line[i - channels] if i >= channels else 0
+            b = prev[i]
+            c = prev[i - channels] if i >= channels else 0
+            if ftype == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif ftype == 2:
+                line[i] = (line[i] + b) & 0xFF
+            elif ftype == 3:
+                line[i] = (line[i] + ((a + b) >> 1)) & 0xFF
+            elif ftype == 4:
+                line[i] = (line[i] + _paeth(a, b, c)) & 0xFF
+        prev = line
+
+        row = []
+        for x in range(width):
+            px = line[x * channels:(x + 1) * channels]
+            if ctype == 0:
+                row.append((px[0], px[0], px[0], 255))
+            elif ctype == 2:
+                row.append((px[0], px[1], px[2], 255))
+            elif ctype == 3:
+                r, g, b = palette[px[0]]
+                a = trns[px[0]] if trns and px[0] < len(trns) else 255
+                row.append((r, g, b, a))
+            elif ctype == 4:
+                row.append((px[0], px[0], px[0], px[1]))
+            else:
+                row.append((px[0], px[1], px[2], px[3]))
+        rows.append(row)
+    return width, height, rows
+
+
+def rgb565(r, g, b):
+    """8bit RGBをRGB565に変換"""
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def to_pixels(rows, bg=0x0000):
+    """RGBA行を RGB565 のリストに変換（アルファは背景色と合成）"""
+    bg_r = (bg >> 8) & 0xF8
+    bg_g = (bg >> 3) & 0xFC
+    bg_b = (bg << 3) & 0xF8
+    pixels = []
+    for row in rows:
+        for r, g, b, a in row:
+            if a < 255:
+                r = (r * a + bg_r * (255 - a)) // 255
+                g = (g * a + bg_g * (255 - a)) // 255
+                b = (b * a + bg_b * (255 - a)) // 255
+            pixels.append(rgb565(r, g, b))
+    return pixels
+
+
+def encode_rle(pixels):
+    """
+    RGB565ピクセル列をRLEパケットに変換
+
+    ヘッダ1バイト h:
+        h & 0x80 != 0 : (h & 0x7F) + 1 個の同色ピクセル、続く2バイトが色 (BE)
+        h & 0x80 == 0 : h + 1 個のリテラルピクセル、続く 2 * (h + 1) バイト
+    """
+    out = bytearray()
+    literal = []
+    i = 0
+    n = len(pixels)
+
+    def flush_literal():
+        while literal:
+            part = literal[:RLE_MAX]
+            del literal[:RLE_MAX]
+            out.append(len(part) - 1)
+            for p in part:
+                out.extend(struct.pack(">H", p))
+
+    while i < n:
+        run = 1
+        while i + run < n and run < RLE_MAX and pixels[i + run] == pixels[i]:
+            run += 1
+        if run >= 2:
+            flush_literal()
+            out.append(0x80 | (run - 1))
+            out.extend(struct.pack(">H", pixels[i]))
+            i += run
+        else:
+            literal.append(pixels[i])
+            i += 1
+    flush_literal()
+    return bytes(out)
+
+
+def decode_rle(data, count):
+    """encode_rle の逆変換（検証・キャプチャ復元用）"""
+    pixels = []
+    pos = 0
+    while len(pixels) < count:
+        h = data[pos]
+        pos += 1
+        if h & 0x80:
+            color = struct.unpack(">H", data[pos:pos + 2])[0]
+            pos += 2
+            pixels.extend([color] * ((h & 0x7F) + 1))
+        else:
+            for _ in range(h + 1):
+                pixels.append(struct.unpack(">H", data[pos:pos + 2])[0])
+                pos += 2
+    return pixels, pos
+
+
+def convert(src, dst, rle=False, bg=0x0000):
+    """PNGファイルを画像アセットに変換し、出力サイズを返す"""
+    width, height, rows = read_png(src)
+    pixels = to_pixels(rows, bg)
+    if rle:
+        payload = encode_rle(pixels)
+        raw_size = len(pixels) * 2
+        # RLEで小さくならない画像は非圧縮で保存
+        if len(payload) >= raw_size:
+            rle = False
+    if not rle:
+        payload = b"".join(struct.pack(">H", p) for p in pixels)
+    flags = FLAG_RLE if rle else 0
+    with open(dst, "wb") as f:
+        f.write(struct.pack(HEADER, MAGIC, width, height, flags))
+        f.write(payload)
+    return width, height, flags, HEADER_SIZE + len(payload)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert PNG to RGB565 image asset")
+    parser.add_argument("src", help="input PNG file")
+    parser.add_argument("dst", help="output asset file (.img)")
+    parser.add_argument("--rle", action="store_true", help="RLE-compress the pixel data")
+    parser.add_argument("--bg", default="0000",
+                        help="RGB565 background color (hex) for transparent pixels")
+    args = parser.parse_args(argv)
+
+    width, height, flags, size = convert(args.src, args.dst, args.rle, int(args.bg, 16))
+    print("{}: {}x{} {} {} bytes".format(
+        args.dst, width, height, "RLE" if flags & FLAG_RLE else "raw", size))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Run the flappy bird soak test on the host with stand-ins
+
+    python tools/soak_host.py [games] [max_frames]
+
+The display is a real st7735.ST7735 on stand-in SPI/pins, so the full
+drawing and flush path runs every frame. Heap figures are only
+available on the board and are printed as "-" here.
+"""
+
+import sys
+
+import hostenv
+
+hostenv.setup()
+
+import soak  # noqa: E402
+
+
+class HostRuntime:
+    def __init__(self):
+        self.display = hostenv.make_display()
+        self.spi = self.display.spi
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    max_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rt = HostRuntime()
+    soak.run(rt, games=games, max_frames=max_frames)
+    print("spi: {} bytes, {:.1f} ms bus time at {} MHz".format(
+        rt.spi.bytes_written, rt.spi.bytes_written * 8000 / rt.spi.baudrate, rt.spi.baudrate // 1000000))
+
+
+if __name__ == "__main__":
+    main()
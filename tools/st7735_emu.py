@@ -0,0 +1,270 @@
+"""
+ST7735 command-stream panel emulator (host side)
+
+Plugs in as the SPI/DC/CS stand-ins of an `st7735.ST7735`, decodes the
+command stream into panel state (MADCTL, COLMOD, CASET/RASET window) and
+a virtual 132x162 GRAM, and accounts the SPI bus time implied by the
+configured baudrate.
+
+    emu = PanelEmulator(baudrate=20000000)
+    display = st7735.ST7735(emu.spi, cs=emu.cs, dc=emu.dc, rst=emu.rst, ...)
+    display.init()
+    with emu.measure() as m:
+        display.show()
+    print(m.bytes, m.bus_us, m.fps_ceiling)
+
+Address model: a RAMWR pixel at logical column c / row r is stored at
+GRAM (col, row) = (c, r), exchanged when MV is set, then mirrored by MX
+(col) and MY (row). The 128x160 glass shows the GRAM area starting at
+`glass_offset`.
+"""
+
+import hostenv
+
+hostenv.setup()
+
+from machine import Pin, SPI  # noqa: E402
+
+# コマンド
+SWRESET = 0x01
+SLPOUT = 0x11
+NORON = 0x13
+INVOFF = 0x20
+INVON = 0x21
+DISPOFF = 0x28
+DISPON = 0x29
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+MADCTL = 0x36
+COLMOD = 0x3A
+
+# MADCTL ビット
+MY = 0x80
+MX = 0x40
+MV = 0x20
+BGR = 0x08
+
+GRAM_W = 132
+GRAM_H = 162
+
+
+class Measurement:
+    """measure() の区間で転送されたバイト数とバス時間"""
+
+    def __init__(self, emu):
+        self.emu = emu
+        self.bytes = 0
+        self.data_bytes = 0
+        self.commands = 0
+        self.transactions = 0
+        self.pixels = 0
+
+    @property
+    def bus_us(self):
+        return self.bytes * 8 * 1000000 / self.emu.baudrate
+
+    @property
+    def fps_ceiling(self):
+        """この区間を1フレームとしたときのバス律速のフレームレート上限"""
+        return 1000000 / self.bus_us if self.bytes else float("inf")
+
+    def __enter__(self):
+        self._start = self.emu.counters()
+        return self
+
+    def __exit__(self, *exc):
+        end = self.emu.counters()
+        self.bytes, self.data_bytes, self.commands, self.transactions, self.pixels = [
+            b - a for a, b in zip(self._start, end)]
+        return False
+
+
+class PanelEmulator:
+    def __init__(self, baudrate=20000000, glass_size=(128, 160), glass_offset=(2, 1)):
+        self.baudrate = baudrate
+        self.glass_size = glass_size
+        self.glass_offset = glass_offset
+        self.spi = SPI(0, baudrate=baudrate)
+        self.spi.on_write = self._on_write
+        self.cs = Pin(6, Pin.OUT, value=1)
+        self.dc = Pin(5, Pin.OUT)
+        self.rst = Pin(4, Pin.OUT, value=1)
+        self.gram = [0] * (GRAM_W * GRAM_H)
+        self.written = bytearray(GRAM_W * GRAM_H)
+        # パネル状態
+        self.madctl = 0
+        self.colmod = 0x06
+        self.caset = (0, GRAM_W - 1)
+        self.raset = (0, GRAM_H - 1)
+        self.display_on = False
+        self.sleeping = True
+        self.log = []
+        self._cmd = None
+        self._params = bytearray()
+        self._col = 0
+        self._row = 0
+        self._half = None
+        # 統計
+        self.total_bytes = 0
+        self.data_bytes = 0
+        self.command_count = 0
+        self.transactions = 0
+        self.pixels = 0
+        self.errors = []
+
+    # --- 計測 ---
+    def counters(self):
+        return (self.total_bytes, self.data_bytes, self.command_count, self.transactions, self.pixels)
+
+    def measure(self):
+        return Measurement(self)
+
+    def bus_us(self):
+        return self.total_bytes * 8 * 1000000 / self.baudrate
+
+    # --- SPI デコード ---
+    def _on_write(self, buf):
+        buf = bytes(buf)
+        if self.cs.value():
+            self.errors.append("write while CS is high")
+            return
+        self.transactions += 1
+        self.total_bytes += len(buf)
+        if self.dc.value() == 0:
+            for b in buf:
+                self._command(b)
+        else:
+            self.data_bytes += len(buf)
+            self._data(buf)
+
+    def _command(self, cmd):
+        self.command_count += 1
+        self._cmd = cmd
+        self._params = bytearray()
+        self._half = None
+        self.log.append(cmd)
+        if cmd == SWRESET:
+            self.madctl = 0
+            self.colmod = 0x06
+            self.caset = (0, GRAM_W - 1)
+            self.raset = (0, GRAM_H - 1)
+            self.display_on = False
+            self.sleeping = True
+        elif cmd == SLPOUT:
+            self.sleeping = False
+        elif cmd == DISPON:
+            self.display_on = True
+        elif cmd == DISPOFF:
+            self.display_on = False
+        elif cmd == RAMWR:
+            self._col = self.caset[0]
+            self._row = self.raset[0]
+
+    def _data(self, buf):
+        cmd = self._cmd
+        if cmd == RAMWR:
+            self._pixels(buf)
+            return
+        self._params.extend(buf)
+        p = self._params
+        if cmd == MADCTL and len(p) >= 1:
+            self.madctl = p[0]
+        elif cmd == COLMOD and len(p) >= 1:
+            self.colmod = p[0]
+        elif cmd == CASET and len(p) >= 4:
+            self.caset = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif cmd == RASET and len(p) >= 4:
+            self.raset = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+
+    def _pixels(self, buf):
+        if self.colmod & 0x07 != 0x05:
+            self.errors.append("RAMWR without 16-bit COLMOD")
+        i = 0
+        if self._half is not None:
+            self._store((self._half << 8) | buf[0])
+            self._half = None
+            i = 1
+        n = len(buf)
+        while i + 1 < n:
+            self._store((buf[i] << 8) | buf[i + 1])
+            i += 2
+        if i < n:
+            self._half = buf[i]
+
+    def address(self, col, row):
+        """論理アドレス (col, row) を GRAM のインデックスに変換（範囲外は None）"""
+        a, b = col, row
+        if self.madctl & MV:
+            a, b = b, a
+        if self.madctl & MX:
+            a = GRAM_W - 1 - a
+        if self.madctl & MY:
+            b = GRAM_H - 1 - b
+        if 0 <= a < GRAM_W and 0 <= b < GRAM_H:
+            return b * GRAM_W + a
+        return None
+
+    def _store(self, color):
+        index = self.address(self._col, self._row)
+        if index is None:
+            self.errors.append("pixel outside GRAM at ({}, {})".format(self._col, self._row))
+        else:
+            self.gram[index] = color
+            self.written[index] = 1
+        self.pixels += 1
+        # ウィンドウ内でアドレスを進める
+        self._col += 1
+        if self._col > self.caset[1]:
+            self._col = self.caset[0]
+            self._row += 1
+            if self._row > self.raset[1]:
+                self._row = self.raset[0]
+
+    # --- 結果の取得 ---
+    def readback(self, x, y, w, h, col_offset=0, row_offset=0):
+        """論理アドレス空間の矩形を、FrameBuffer と同じ RGB565 リトルエンディアンで返す"""
+        out = bytearray(w * h * 2)
+        i = 0
+        for yy in range(y, y + h):
+            for xx in range(x, x + w):
+                index = self.address(xx + col_offset, yy + row_offset)
+                c = self.gram[index] if index is not None else 0
+                out[i] = c & 0xFF
+                out[i + 1] = c >> 8
+                i += 2
+        return out
+
+    def glass(self):
+        """ガラス（表示領域）のピクセルを GRAM の向きで行ごとに返す"""
+        ox, oy = self.glass_offset
+        gw, gh = self.glass_size
+        return [self.gram[(oy + y) * GRAM_W + ox:(oy + y) * GRAM_W + ox + gw] for y in range(gh)]
+
+    def stray_pixels(self):
+        """ガラスの外に書き込まれたピクセル数（オフセットの誤りを検出）"""
+        ox, oy = self.glass_offset
+        gw, gh = self.glass_size
+        count = 0
+        for index, w in enumerate(self.written):
+            if not w:
+                continue
+            col = index % GRAM_W
+            row = index // GRAM_W
+            if not (ox <= col < ox + gw and oy <= row < oy + gh):
+                count += 1
+        return count
+
+    def clear_written(self):
+        self.written = bytearray(GRAM_W * GRAM_H)
+
+    def save_ppm(self, path):
+        """ガラスの画像を PPM (P6) で保存"""
+        rows = self.glass()
+        with open(path, "wb") as f:
+            f.write("P6 {} {} 255\n".format(len(rows[0]), len(rows)).encode())
+            for row in rows:
+                for c in row:
+                    f.write(bytes((((c >> 11) & 0x1F) * 255 // 31,
+                                  ((c >> 5) & 0x3F) * 255 // 63,
+                                  (c & 0x1F) * 255 // 31)))